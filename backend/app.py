@@ -3,10 +3,13 @@ from flask.json.provider import DefaultJSONProvider
 from flask_smorest import Api
 from flask_cors import CORS
 from dotenv import load_dotenv
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas as rl_canvas
+import io
 import math
 
 # Import all route Blueprints
-from resources.upload_routes import blp as UploadBlueprint
+from resources.upload_routes import blp as UploadBlueprint, UploadRequest
 from resources.preprocess_routes import blp as PreprocessBlueprint
 from resources.bias_routes import blp as BiasBlueprint
 from resources.report_routes import blp as ReportBlueprint
@@ -26,6 +29,8 @@ class CustomJSONProvider(DefaultJSONProvider):
 def create_app():
     """Application factory for BiasXplorer API"""
     app = Flask(__name__)
+    # Multipart uploads stream to disk and are renamed into place
+    app.request_class = UploadRequest
     load_dotenv()
 
     # Set custom JSON provider to handle NaN values
@@ -33,6 +38,8 @@ def create_app():
 
     # Flask-Smorest / OpenAPI setup
     app.config["PROPAGATE_EXCEPTIONS"] = True
+    # Upper bound for request bodies (multipart and raw octet-stream uploads)
+    app.config["MAX_CONTENT_LENGTH"] = 2 * 1024 ** 3
     app.config["API_TITLE"] = "BiasXplorer API"
     app.config["API_VERSION"] = "v1"
     app.config["OPENAPI_VERSION"] = "3.0.3"
@@ -40,18 +47,22 @@ def create_app():
     app.config["OPENAPI_SWAGGER_UI_PATH"] = "/swagger-ui"
     app.config["OPENAPI_SWAGGER_UI_URL"] = "https://cdn.jsdelivr.net/npm/swagger-ui-dist/"
 
-    # Initialize in-memory store for column types
-    app.config["COLUMN_TYPES_STORE"] = {}
-
     # CORS setup (frontend on localhost:5173)
     CORS(
         app,
         resources={r"/*": {"origins": ["http://localhost:5173"]}},
         supports_credentials=True,
-        allow_headers=["Content-Type", "Authorization"],
+        allow_headers=["Content-Type", "Authorization", "X-Filename"],
         methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"]
     )
 
+    # Warm reportlab's font metrics and PDF machinery so the first report
+    # request doesn't pay for it
+    warmup = rl_canvas.Canvas(io.BytesIO(), pagesize=letter, invariant=1)
+    warmup.setFont("Helvetica", 11)
+    warmup.showPage()
+    warmup.save()
+
     # Initialize Flask-Smorest API
     api = Api(app)
 
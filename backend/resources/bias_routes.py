@@ -1,5 +1,6 @@
 """Refactored bias detection and correction routes using service layer."""
 import os
+import pandas as pd
 from flask import request, jsonify
 from flask.views import MethodView
 from flask_smorest import Blueprint, abort
@@ -13,6 +14,7 @@ from services import (
     VisualizationService
 )
 from utils.validators import PathValidator
+from resources.select_routes import get_column_types
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 UPLOAD_DIR = os.path.join(BASE_DIR, "uploads")
@@ -49,13 +51,20 @@ class DetectBias(MethodView):
                 return jsonify({"error": "'file_path' is required in JSON body."}), 400
 
             # Validate path
-            abs_path, error = PathValidator.validate_upload_path(
+            abs_path, st, error = PathValidator.validate_upload_path_stat(
                 file_path, BASE_DIR, UPLOAD_DIR)
             if error:
                 return jsonify({"error": error}), 400
 
-            # Read full dataset
-            df = FileService.read_dataset(abs_path)
+            # Use stored column types if categorical not provided
+            if categorical is None:
+                categorical = get_column_types(
+                    file_path).get("categorical", [])
+
+            if isinstance(categorical, str):
+                categorical = [categorical]
+            if not isinstance(categorical, list):
+                return jsonify({"error": "'categorical' must be a list of column names if provided."}), 400
 
             # Filter to selected columns if provided (from memory store)
             if not selected_columns:
@@ -63,25 +72,20 @@ class DetectBias(MethodView):
                 store = current_app.config.get("SELECTED_FEATURES_STORE", {})
                 selected_columns = store.get(file_path, [])
 
+            # Parse only the columns used below (reusing the validator's stat);
+            # counting integer labels touches fewer bytes once downcast
+            df = FileService.read_dataset(
+                abs_path, st=st, columns=categorical + list(selected_columns),
+                downcast=True)
+
             # If selected columns exist, use only those
             if selected_columns:
-                available_cols = set(df.columns)
-                cols_to_use = [
-                    col for col in selected_columns if col in available_cols]
-                if cols_to_use:
+                # Single C-level intersection instead of per-column membership checks
+                cols_to_use = pd.Index(selected_columns).intersection(
+                    df.columns, sort=False)
+                if not cols_to_use.empty:
                     df = df[cols_to_use]
 
-            # Use stored column types if categorical not provided
-            if categorical is None:
-                from flask import current_app
-                store = current_app.config.get("COLUMN_TYPES_STORE", {})
-                categorical = store.get(file_path, {}).get("categorical", [])
-
-            if isinstance(categorical, str):
-                categorical = [categorical]
-            if not isinstance(categorical, list):
-                return jsonify({"error": "'categorical' must be a list of column names if provided."}), 400
-
             # Detect bias only on categorical columns that exist in selected columns
             result = BiasDetectionService.detect_imbalance(df, categorical)
 
@@ -107,7 +111,9 @@ class FixBias(MethodView):
           "target_column": "gender",
           "method": "smote" | "oversample" | "undersample" | "reweight",
           "threshold": 0.3  (optional, desired minority/majority ratio for binary classes),
-          "categorical_columns": ["col1", "col2"]  (optional, for SMOTE-NC)
+          "categorical_columns": ["col1", "col2"]  (optional, for SMOTE-NC),
+          "smote_chunk_size": 100000  (optional, SMOTE very large classes in
+                                       parallel row chunks of this size)
         }
 
         Creates fixing_<file>.csv from working file, applies corrections, returns fixing file path.
@@ -120,6 +126,7 @@ class FixBias(MethodView):
             method = (data.get("method") or "").lower()
             threshold = data.get("threshold")
             categorical_columns = data.get("categorical_columns")
+            smote_chunk_size = data.get("smote_chunk_size")
             # Default to True for backwards compatibility
             is_first_fix = data.get("is_first_fix", True)
 
@@ -129,6 +136,11 @@ class FixBias(MethodView):
                 return jsonify({"error": "'target_column' is required in JSON body."}), 400
             if not BiasCorrectionService.validate_method(method):
                 return jsonify({"error": f"'method' must be one of: {', '.join(BiasCorrectionService.VALID_METHODS)}"}), 400
+            # Each chunk needs more rows than SMOTE's 5 neighbours
+            if smote_chunk_size is not None and (
+                    isinstance(smote_chunk_size, bool) or not isinstance(smote_chunk_size, int)
+                    or smote_chunk_size <= 5):
+                return jsonify({"error": "'smote_chunk_size' must be an integer greater than 5."}), 400
 
             # Validate path - should be working file or fixing file from uploads
             abs_path, error = PathValidator.validate_upload_path(
@@ -200,7 +212,8 @@ class FixBias(MethodView):
 
             # Apply correction to fixing file
             df_corrected, metadata = BiasCorrectionService.apply_correction(
-                df_fixing, target_col, method, threshold, categorical_columns
+                df_fixing, target_col, method, threshold, categorical_columns,
+                smote_chunk_size
             )
 
             # Get after statistics
@@ -209,7 +222,7 @@ class FixBias(MethodView):
 
             # Save corrected dataset to fixing file (not working file)
             FileService.save_dataset(
-                df_corrected, fixing_path, ensure_dir=True)
+                df_corrected, fixing_path, ensure_dir=True, gzip_copy=True)
             print(f"[FixBias] Saved corrected data to: {fixing_path}")
 
             # Calculate severity for after distribution
@@ -294,19 +307,21 @@ class VisualizeBias(MethodView):
                 return jsonify({"error": "'before_path', 'after_path', and 'target_column' are required."}), 400
 
             # Validate paths
-            before_abs, error = PathValidator.validate_any_path(
+            before_abs, before_st, error = PathValidator.validate_any_path_stat(
                 before_path, BASE_DIR, UPLOAD_DIR, CORRECTED_DIR)
             if error:
                 return jsonify({"error": f"Before path: {error}"}), 400
 
-            after_abs, error = PathValidator.validate_any_path(
+            after_abs, after_st, error = PathValidator.validate_any_path_stat(
                 after_path, BASE_DIR, UPLOAD_DIR, CORRECTED_DIR)
             if error:
                 return jsonify({"error": f"After path: {error}"}), 400
 
-            # Read datasets
-            df_before = FileService.read_dataset(before_abs)
-            df_after = FileService.read_dataset(after_abs)
+            # Read datasets (only the target column is plotted)
+            df_before = FileService.read_dataset(
+                before_abs, st=before_st, columns=[target_col])
+            df_after = FileService.read_dataset(
+                after_abs, st=after_st, columns=[target_col])
 
             # Debug logging
             print(f"\n{'='*80}")
@@ -390,7 +405,7 @@ class DetectSkew(MethodView):
             # Support both full paths (uploads/file.csv, corrected/file.csv) and just filenames
             if filename.startswith("uploads/") or filename.startswith("corrected/"):
                 # Full path provided
-                abs_path, error = PathValidator.validate_any_path(
+                abs_path, st, error = PathValidator.validate_any_path_stat(
                     filename, BASE_DIR, UPLOAD_DIR, CORRECTED_DIR)
                 if error:
                     abort(400, message=error)
@@ -401,13 +416,12 @@ class DetectSkew(MethodView):
                 if error:
                     abort(400, message=error)
                 abs_path = os.path.join(UPLOAD_DIR, secured)
-                if not os.path.exists(abs_path):
+                try:
+                    st = os.stat(abs_path)
+                except OSError:
                     abort(
                         404, message=f"File '{secured}' not found in uploads")
 
-            # Read full dataset
-            df = FileService.read_dataset(abs_path)
-
             # Filter to selected columns if provided (from memory store or parameter)
             if not selected_columns:
                 from flask import current_app
@@ -415,12 +429,16 @@ class DetectSkew(MethodView):
                 # Try to get from store using filename
                 selected_columns = store.get(filename, [])
 
+            # Parse only the column being measured and the selection
+            df = FileService.read_dataset(
+                abs_path, st=st, columns=[column] + list(selected_columns))
+
             # If selected columns exist, use only those
             if selected_columns:
-                available_cols = set(df.columns)
-                cols_to_use = [
-                    col for col in selected_columns if col in available_cols]
-                if cols_to_use:
+                # Single C-level intersection instead of per-column membership checks
+                cols_to_use = pd.Index(selected_columns).intersection(
+                    df.columns, sort=False)
+                if not cols_to_use.empty:
                     df = df[cols_to_use]
 
             # Detect skewness on the filtered dataset
@@ -536,7 +554,7 @@ class FixSkew(MethodView):
 
             # Save corrected dataset to fixing file
             FileService.save_dataset(
-                df_corrected, fixing_path, ensure_dir=True)
+                df_corrected, fixing_path, ensure_dir=True, gzip_copy=True)
             print(f"[FixSkew] Saved corrected data to: {fixing_path}")
 
             return jsonify({
@@ -583,23 +601,28 @@ class VisualizeSkew(MethodView):
                 abort(400, message="'columns' must be a non-empty list")
 
             # Validate paths
-            before_abs, error = PathValidator.validate_any_path(
+            before_abs, before_st, error = PathValidator.validate_any_path_stat(
                 before_path, BASE_DIR, UPLOAD_DIR, CORRECTED_DIR)
             if error:
                 abort(400, message=f"Before path error: {error}")
 
-            after_abs, error = PathValidator.validate_any_path(
+            after_abs, after_st, error = PathValidator.validate_any_path_stat(
                 after_path, BASE_DIR, UPLOAD_DIR, CORRECTED_DIR)
             if error:
                 abort(400, message=f"After path error: {error}")
 
-            # Read datasets
-            df_before = FileService.read_dataset(before_abs)
-            df_after = FileService.read_dataset(after_abs)
+            # Read datasets (only the plotted columns)
+            df_before = FileService.read_dataset(
+                before_abs, st=before_st, columns=columns)
+            df_after = FileService.read_dataset(
+                after_abs, st=after_st, columns=columns)
 
-            # Generate visualizations
+            # Generate visualizations; a repeat view of unchanged files is
+            # served from the result cache
+            versions = (before_abs, before_st.st_mtime_ns, before_st.st_size,
+                        after_abs, after_st.st_mtime_ns, after_st.st_size)
             charts = VisualizationService.visualize_skewness(
-                df_before, df_after, columns)
+                df_before, df_after, columns, versions=versions)
 
             return jsonify({"charts": charts}), 200
 
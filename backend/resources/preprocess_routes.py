@@ -1,7 +1,10 @@
-from flask import request, jsonify
+from flask import request, jsonify, current_app, send_file
 from flask.views import MethodView
 from flask_smorest import Blueprint
 import os
+import numpy as np
+import orjson
+import pandas as pd
 
 from services import FileService
 from utils.validators import PathValidator
@@ -50,27 +53,26 @@ class PreprocessDatatset(MethodView):
                 return jsonify({"error": "'file_path' is required in JSON body."}), 400
 
             # Validate path
-            abs_path, error = PathValidator.validate_upload_path(
+            abs_path, st, error = PathValidator.validate_upload_path_stat(
                 file_path, BASE_DIR, UPLOAD_DIR)
             if error:
                 return jsonify({"error": error}), 400
 
-            # Read dataset
-            df = FileService.read_dataset(abs_path)
+            # Read dataset (reusing the validator's stat)
+            df = FileService.read_dataset(abs_path, st=st)
 
             # Replace '?' with NaN to treat it as a null value
             df = df.replace('?', None)
 
             # Determine columns to clean
             if selected_columns and len(selected_columns) > 0:
-                # Validate selected columns exist
-                df_columns = set(df.columns)
-                selected_set = set(selected_columns)
-                missing_cols = selected_set - df_columns
+                # Validate selected columns exist (hash-index difference runs in C)
+                missing_cols = pd.Index(selected_columns).difference(
+                    df.columns).tolist()
                 if missing_cols:
                     return jsonify({
                         "error": "Some selected columns not found in dataset.",
-                        "details": {"missing_columns": list(missing_cols)}
+                        "details": {"missing_columns": missing_cols}
                     }), 400
                 columns_to_clean = selected_columns
             else:
@@ -85,99 +87,130 @@ class PreprocessDatatset(MethodView):
             fill_actions = {}
             total_rows_removed = 0
 
-            # Process columns SEQUENTIALLY - each operation updates df for next column
+            # Process columns SEQUENTIALLY - each operation updates df for next column.
+            # Only "remove" changes which rows remain, so every fill between two
+            # removals sees the same frame; such runs are filled with one vectorized
+            # mean/median/mode reduction over the block instead of per-column calls.
+            numeric_dtypes = ['float64', 'float32', 'int64', 'int32']
+            pending_fills = []
+
+            def flush_fills():
+                nonlocal df
+                if not pending_fills:
+                    return
+
+                block_cols = list(dict.fromkeys(col for col, _ in pending_fills))
+                missing_counts = df[block_cols].isna().sum()
+                numeric_cols = {
+                    col for col in block_cols if df[col].dtype in numeric_dtypes}
+
+                def numeric_for(name):
+                    return list(dict.fromkeys(
+                        col for col, strategy in pending_fills
+                        if strategy == name and col in numeric_cols))
+
+                # Non-numeric mean/median columns fall back to mode
+                mean_cols = numeric_for("mean")
+                median_cols = numeric_for("median")
+                mode_cols = list(dict.fromkeys(
+                    col for col, strategy in pending_fills
+                    if strategy == "mode" or (strategy in ("mean", "median") and col not in numeric_cols)))
+
+                means = df[mean_cols].mean() if mean_cols else None
+                medians = df[median_cols].median() if median_cols else None
+                modes = df[mode_cols].mode(
+                    dropna=True) if mode_cols else pd.DataFrame()
+                first_modes = modes.iloc[0] if not modes.empty else pd.Series(
+                    dtype=object)
+
+                fill_values = {}
+                for col, strategy in pending_fills:
+                    filled_count = missing_counts[col]
+                    if strategy == "keep":
+                        # Do nothing - keep missing values as is
+                        fill_actions[col] = f"Kept {filled_count} missing values unchanged"
+                    elif strategy == "mean" and col in numeric_cols:
+                        mean_val = means[col]
+                        fill_values[col] = mean_val
+                        fill_actions[col] = f"Filled {filled_count} values with mean ({mean_val:.2f})"
+                    elif strategy == "median" and col in numeric_cols:
+                        median_val = medians[col]
+                        fill_values[col] = median_val
+                        fill_actions[
+                            col] = f"Filled {filled_count} values with median ({median_val:.2f})"
+                    else:
+                        mode_val = first_modes.get(col)
+                        if mode_val is not None and not pd.isna(mode_val):
+                            fill_values[col] = mode_val
+                            fill_actions[col] = f"Filled {filled_count} values with mode ({mode_val})"
+                        else:
+                            fill_actions[col] = "No valid mode found, values unchanged"
+
+                if fill_values:
+                    df = df.fillna(fill_values)
+                pending_fills.clear()
+
             for col in columns_to_clean:
                 # Default to keep (do nothing)
                 strategy = fill_strategies.get(col, "keep")
-                rows_before_col = len(df)
-
-                if strategy == "keep":
-                    # Do nothing - keep missing values as is
-                    missing_count = df[col].isna().sum()
-                    fill_actions[col] = f"Kept {missing_count} missing values unchanged"
 
-                elif strategy == "remove":
+                if strategy == "remove":
+                    # Apply pending fills first: they must see the rows as they were
+                    flush_fills()
+                    rows_before_col = len(df)
                     # Drop rows with NaN in THIS column, changes propagate to next iterations
                     df = df.dropna(subset=[col])
                     rows_removed_this_col = rows_before_col - len(df)
                     total_rows_removed += rows_removed_this_col
                     fill_actions[col] = f"Removed {rows_removed_this_col} rows with NaN"
 
-                elif strategy == "mean":
-                    if df[col].dtype in ['float64', 'float32', 'int64', 'int32']:
-                        # Recalculate mean based on current df state (after previous operations)
-                        mean_val = df[col].mean()
-                        filled_count = df[col].isna().sum()
-                        df[col].fillna(mean_val, inplace=True)
-                        fill_actions[col] = f"Filled {filled_count} values with mean ({mean_val:.2f})"
-                    else:
-                        # Fallback to mode for non-numeric
-                        mode_val = df[col].mode(
-                        )[0] if not df[col].mode().empty else None
-                        if mode_val is not None:
-                            filled_count = df[col].isna().sum()
-                            df[col].fillna(mode_val, inplace=True)
-                            fill_actions[col] = f"Filled {filled_count} values with mode ({mode_val})"
-                        else:
-                            fill_actions[col] = "No valid mode found, values unchanged"
+                elif strategy in ("keep", "mean", "median", "mode"):
+                    pending_fills.append((col, strategy))
 
-                elif strategy == "median":
-                    if df[col].dtype in ['float64', 'float32', 'int64', 'int32']:
-                        # Recalculate median based on current df state
-                        median_val = df[col].median()
-                        filled_count = df[col].isna().sum()
-                        df[col].fillna(median_val, inplace=True)
-                        fill_actions[
-                            col] = f"Filled {filled_count} values with median ({median_val:.2f})"
-                    else:
-                        # Fallback to mode for non-numeric
-                        mode_val = df[col].mode(
-                        )[0] if not df[col].mode().empty else None
-                        if mode_val is not None:
-                            filled_count = df[col].isna().sum()
-                            df[col].fillna(mode_val, inplace=True)
-                            fill_actions[col] = f"Filled {filled_count} values with mode ({mode_val})"
-                        else:
-                            fill_actions[col] = "No valid mode found, values unchanged"
-
-                elif strategy == "mode":
-                    # Recalculate mode based on current df state
-                    mode_val = df[col].mode(
-                    )[0] if not df[col].mode().empty else None
-                    if mode_val is not None:
-                        filled_count = df[col].isna().sum()
-                        df[col].fillna(mode_val, inplace=True)
-                        fill_actions[col] = f"Filled {filled_count} values with mode ({mode_val})"
-                    else:
-                        fill_actions[col] = "No valid mode found, values unchanged"
+            flush_fills()
 
             rows_after_dropna = len(df)
 
             # Drop duplicate rows considering SELECTED columns only
             # This happens AFTER all column-specific operations
             rows_before_dedup = len(df)
-            df = df.drop_duplicates(subset=columns_to_clean)
+            if columns_to_clean and rows_before_dedup > 1:
+                # Factorize each key column to int codes and dedup the stacked
+                # codes in NumPy; NaN factorizes to -1 so missing keys still match
+                codes = np.column_stack(
+                    [pd.factorize(df[c])[0] for c in columns_to_clean])
+                _, keep_idx = np.unique(codes, axis=0, return_index=True)
+                df = df.iloc[np.sort(keep_idx)]
             rows_after = len(df)
             duplicates_removed = rows_before_dedup - rows_after
 
             # Save back to the SAME working file (in-place modification)
             # No separate cleaned_ file is created
             FileService.save_dataset(df, abs_path, ensure_dir=True)
+            # Columnar copy so downstream endpoints skip CSV tokenizing; built
+            # from the saved file, so its dtypes are the ones the CSV gives
+            # (df still holds object columns where '?' was replaced)
+            FileService.schedule_parquet_copy(abs_path)
 
             rows, cols = df.shape
 
-            return jsonify({
+            payload = {
                 "message": "Preprocessing complete (working file modified in-place, sequential per column)",
                 "selected_columns_cleaned": columns_to_clean,
                 "fill_actions": fill_actions,
-                "missing_values": {k: int(v) for k, v in missing_before.items() if v > 0},
-                "rows_before": int(rows_before),
-                "rows_with_na_removed": int(total_rows_removed),
-                "duplicates_removed": int(duplicates_removed),
-                "rows_after": int(rows_after),
-                "dataset_shape": [int(rows), int(cols)],
+                "missing_values": {k: v for k, v in missing_before.items() if v > 0},
+                "rows_before": rows_before,
+                "rows_with_na_removed": total_rows_removed,
+                "duplicates_removed": duplicates_removed,
+                "rows_after": rows_after,
+                "dataset_shape": [rows, cols],
                 "file_path": file_path  # Return same file path - modified in-place
-            }), 200
+            }
+
+            # orjson encodes numpy scalars natively, so no int() re-boxing is needed
+            body = orjson.dumps(
+                payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+            return current_app.response_class(body, mimetype="application/json"), 200
 
         except FileNotFoundError:
             return jsonify({"error": "File not found."}), 400
@@ -185,3 +218,32 @@ class PreprocessDatatset(MethodView):
             return jsonify({"error": f"Invalid file format: {str(e)}"}), 400
         except Exception as e:
             return jsonify({"error": str(e)}), 400
+
+
+@blp.route("/preprocess/export")
+class ExportDataset(MethodView):
+    def get(self):
+        """Download a preprocessed working dataset as CSV.
+        Query string: ?file_path=uploads/working_filename.csv
+
+        Preprocessing writes the CSV before its Parquet copy, so the CSV is
+        always current and is streamed as is; the request never rewrites it.
+        """
+        try:
+            file_path = request.args.get("file_path")
+            if not file_path:
+                return jsonify({"error": "'file_path' query parameter is required."}), 400
+
+            # Validate path
+            abs_path, error = PathValidator.validate_upload_path(
+                file_path, BASE_DIR, UPLOAD_DIR)
+            if error:
+                return jsonify({"error": error}), 400
+
+            return send_file(abs_path, mimetype="text/csv", as_attachment=True,
+                             download_name=os.path.basename(abs_path))
+
+        except FileNotFoundError:
+            return jsonify({"error": "File not found."}), 400
+        except Exception as e:
+            return jsonify({"error": str(e)}), 400
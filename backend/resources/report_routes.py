@@ -5,20 +5,35 @@ from reportlab.pdfgen import canvas as rl_canvas
 from flask import request, jsonify
 from flask.views import MethodView
 from flask_smorest import Blueprint
+
+from services import FileService
 import os
-from flask import send_from_directory
+import logging
+from flask import send_from_directory, send_file
+from werkzeug.utils import safe_join
 import io
-import base64
-import matplotlib
-matplotlib.use("Agg")
-ALLOWED_EXTENSIONS = {"csv", "xls", "xlsx"}
+import binascii
+import struct
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 UPLOAD_DIR = os.path.join(BASE_DIR, "uploads")
 REPORTS_DIR = os.path.join(BASE_DIR, "reports")
 CORRECTED_DIR = os.path.join(BASE_DIR, "corrected")
+# Created once at import so the download handlers stay on the file-serving path
+os.makedirs(REPORTS_DIR, exist_ok=True)
+os.makedirs(UPLOAD_DIR, exist_ok=True)
 blp = Blueprint("Reports", __name__, url_prefix="/api",
                 description="Report endpoints")
 
+logger = logging.getLogger(__name__)
+
+
+def _warn_if_range_without_sendfile(filename: str) -> None:
+    """Log ranged downloads that cannot use the sendfile(2) fast path."""
+    if request.range is not None and not hasattr(os, "sendfile"):
+        logger.warning(
+            "Range request for %s served without os.sendfile; falling back to buffered reads", filename)
+
 
 @blp.route("/reports/generate")
 class GenerateReport(MethodView):
@@ -31,6 +46,9 @@ class GenerateReport(MethodView):
           "visualizations": {"before_chart": "<base64>", "after_chart": "<base64>"}
         }
         Saves as reports/report_<timestamp>.pdf and returns its relative path.
+
+        With ``?inline=1`` the PDF is built in memory and returned directly as an
+        attachment, skipping the disk write and the follow-up download request.
         """
         try:
             payload = request.get_json(silent=True) or {}
@@ -45,12 +63,21 @@ class GenerateReport(MethodView):
             if not isinstance(visualizations, dict):
                 return jsonify({"error": "'visualizations' must be an object."}), 400
 
-            os.makedirs(REPORTS_DIR, exist_ok=True)
-            ts = datetime.now().strftime("%Y_%m_%d_%H%M%S")
-            filename = f"report_{ts}.pdf"
-            pdf_path = os.path.join(REPORTS_DIR, filename)
+            inline = request.args.get("inline", "").lower() in ("1", "true")
+            # One clock read for both the file name and the "Generated" line
+            now = datetime.now()
+            ts_file = now.strftime("%Y_%m_%d_%H%M%S")
+            ts_str = now.strftime("%Y-%m-%d %H:%M:%S")
+            filename = f"report_{ts_file}.pdf"
+            if inline:
+                pdf_target = io.BytesIO()
+            else:
+                pdf_target = os.path.join(REPORTS_DIR, filename)
 
-            c = rl_canvas.Canvas(pdf_path, pagesize=letter)
+            # invariant=1 skips embedded timestamps/random IDs; pageCompression
+            # Flate-compresses page content streams for smaller downloads
+            c = rl_canvas.Canvas(pdf_target, pagesize=letter,
+                                 pageCompression=1, invariant=1)
             width, height = letter
             margin = 50
             y = height - margin
@@ -64,12 +91,30 @@ class GenerateReport(MethodView):
                 c.drawString(margin, y, text)
                 y -= leading
 
+            def write_lines(lines, fontsize: int = 11, leading: int = 16):
+                """Emit consecutive same-font lines through one text object per page."""
+                nonlocal y
+                start = 0
+                while start < len(lines):
+                    if y < margin + leading:
+                        c.showPage()
+                        y = height - margin
+                    # Same break rule as write_line: a line fits while y >= margin + leading
+                    fit = int((y - margin - leading) // leading) + 1
+                    chunk = lines[start:start + fit]
+                    text_obj = c.beginText(margin, y)
+                    text_obj.setFont("Helvetica", fontsize, leading)
+                    for line in chunk:
+                        text_obj.textLine(line)
+                    c.drawText(text_obj)
+                    y -= leading * len(chunk)
+                    start += len(chunk)
+
             # Title
             c.setTitle("BiasXplorer - Categorical Bias Report")
             write_line("BiasXplorer - Categorical Bias Report",
                        fontsize=16, leading=22)
-            write_line(
-                f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", fontsize=10, leading=14)
+            write_line(f"Generated: {ts_str}", fontsize=10, leading=14)
             y -= 6
 
             # Dataset summary (if any info can be derived)
@@ -89,10 +134,10 @@ class GenerateReport(MethodView):
             # Bias severity table
             write_line("Bias severity:", fontsize=13, leading=18)
             if bias_summary:
-                for col, stats in bias_summary.items():
-                    severity = (stats or {}).get(
-                        "severity", "N/A") if isinstance(stats, dict) else "N/A"
-                    write_line(f"- {col}: {severity}")
+                write_lines([
+                    f"- {col}: {(stats or {}).get('severity', 'N/A') if isinstance(stats, dict) else 'N/A'}"
+                    for col, stats in bias_summary.items()
+                ])
             else:
                 write_line("- No bias summary provided")
             y -= 6
@@ -107,14 +152,14 @@ class GenerateReport(MethodView):
                     counts = before.get("counts", {})
                     if isinstance(counts, dict) and counts:
                         write_line("- Before counts:")
-                        for k, v in list(counts.items())[:10]:
-                            write_line(f"   {k}: {v}", fontsize=10, leading=14)
+                        write_lines([f"   {k}: {v}" for k, v in list(counts.items())[:10]],
+                                    fontsize=10, leading=14)
                 if after:
                     counts = after.get("counts", {})
                     if isinstance(counts, dict) and counts:
                         write_line("- After counts:")
-                        for k, v in list(counts.items())[:10]:
-                            write_line(f"   {k}: {v}", fontsize=10, leading=14)
+                        write_lines([f"   {k}: {v}" for k, v in list(counts.items())[:10]],
+                                    fontsize=10, leading=14)
             else:
                 write_line("- No correction summary provided")
             y -= 6
@@ -123,19 +168,43 @@ class GenerateReport(MethodView):
             before_chart_b64 = visualizations.get("before_chart")
             after_chart_b64 = visualizations.get("after_chart")
 
+            # Decoded charts keyed by their base64 payload, so a chart drawn more
+            # than once (or identical before/after charts) is decoded only once
+            decoded_images = {}
+            image_readers = {}
+
+            def load_b64_image(b64_str: str):
+                if b64_str not in decoded_images:
+                    # a2b_base64 reads the ASCII str directly and BytesIO adopts the
+                    # result without copying: one allocation per chart in total
+                    buf = io.BytesIO(binascii.a2b_base64(b64_str))
+                    header = buf.read(24)
+                    buf.seek(0)
+                    if len(header) == 24 and header[:8] == PNG_SIGNATURE:
+                        # PNG width/height sit in the IHDR chunk at bytes 16-24
+                        iw, ih = struct.unpack(">II", header[16:24])
+                    else:
+                        image_readers[b64_str] = ImageReader(buf)
+                        iw, ih = image_readers[b64_str].getSize()
+                    decoded_images[b64_str] = (buf, iw, ih)
+                return decoded_images[b64_str]
+
             def draw_b64_image(title: str, b64_str: str, max_width: int = 500, max_height: int = 300):
                 nonlocal y
                 try:
-                    img_bytes = base64.b64decode(b64_str)
-                    img = ImageReader(io.BytesIO(img_bytes))
-                    iw, ih = img.getSize()
+                    buf, iw, ih = load_b64_image(b64_str)
                     scale = min(max_width / iw, max_height / ih)
                     w, h = iw * scale, ih * scale
                     if y < margin + h + 40:
                         c.showPage()
                         y = height - margin
                     write_line(title, fontsize=12, leading=16)
-                    c.drawImage(img, margin, y - h, width=w, height=h)
+                    # The reader (and its pixel decode) is only built when drawing
+                    if b64_str not in image_readers:
+                        image_readers[b64_str] = ImageReader(buf)
+                    img = image_readers[b64_str]
+                    c.drawImage(img, margin, y - h, width=w, height=h,
+                                preserveAspectRatio=True, mask='auto')
                     y -= h + 16
                 except Exception:
                     write_line(
@@ -149,6 +218,11 @@ class GenerateReport(MethodView):
             c.showPage()
             c.save()
 
+            if inline:
+                pdf_target.seek(0)
+                return send_file(pdf_target, mimetype="application/pdf",
+                                 as_attachment=True, download_name=filename)
+
             return jsonify({"report_path": f"api/reports/download/{filename}"}), 200
 
         except Exception as e:
@@ -158,11 +232,19 @@ class GenerateReport(MethodView):
 @blp.route("/reports/download/<path:filename>")
 class ServeReport(MethodView):
     def get(self, filename):
-        """Serve generated PDF reports from the reports directory."""
+        """Serve generated PDF reports from the reports directory.
+
+        Responses are conditional (ETag/Last-Modified, 206 for Range, 304 for
+        If-None-Match/If-Modified-Since) and carry a Content-Length, so WSGI
+        servers exposing ``wsgi.file_wrapper`` (gunicorn, uWSGI) stream the
+        body with sendfile(2).
+        """
         try:
-            os.makedirs(REPORTS_DIR, exist_ok=True)
-            # send_from_directory safely joins and serves files under REPORTS_DIR
-            return send_from_directory(REPORTS_DIR, filename, as_attachment=True)
+            _warn_if_range_without_sendfile(filename)
+            # send_from_directory safely joins and serves files under REPORTS_DIR;
+            # Last-Modified is taken from the file's mtime
+            return send_from_directory(REPORTS_DIR, filename, as_attachment=True,
+                                       conditional=True, etag=True, max_age=0)
         except Exception as e:
             return jsonify({"error": str(e)}), 400
 
@@ -174,14 +256,31 @@ class ServeCorrected(MethodView):
 
         Now downloads fixing_<file>.csv (corrected data) instead of working files.
         The frontend passes paths like 'uploads/fixing_file.csv', extract the filename.
+
+        Clients sending ``Accept-Encoding: gzip`` get the pre-compressed
+        fixing_<file>.csv.gz companion when it is up to date; others (and
+        stale companions) get the plain file via the sendfile path.
         """
         try:
             # Extract filename from path (e.g., 'uploads/fixing_file.csv' -> 'fixing_file.csv')
             if filename.startswith('uploads/'):
                 filename = filename[len('uploads/'):]
-            
-            os.makedirs(UPLOAD_DIR, exist_ok=True)
-            # Security: ensure we only serve inside UPLOAD_DIR
-            return send_from_directory(UPLOAD_DIR, filename, as_attachment=True)
+
+            _warn_if_range_without_sendfile(filename)
+
+            # Security: safe_join returns None for paths escaping UPLOAD_DIR
+            abs_path = safe_join(UPLOAD_DIR, filename)
+            if abs_path and request.accept_encodings["gzip"] and FileService.fresh_gzip_path(abs_path):
+                response = send_from_directory(
+                    UPLOAD_DIR, f"{filename}.gz", as_attachment=True,
+                    download_name=os.path.basename(filename), mimetype="text/csv",
+                    conditional=True, etag=True, max_age=0)
+                response.headers["Content-Encoding"] = "gzip"
+            else:
+                # Security: ensure we only serve inside UPLOAD_DIR
+                response = send_from_directory(UPLOAD_DIR, filename, as_attachment=True,
+                                               conditional=True, etag=True, max_age=0)
+            response.vary.add("Accept-Encoding")
+            return response
         except Exception as e:
             return jsonify({"error": str(e)}), 400
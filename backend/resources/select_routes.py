@@ -2,6 +2,7 @@ from flask import request, jsonify, current_app
 from flask.views import MethodView
 from flask_smorest import Blueprint
 import os
+import threading
 
 from services import FileService
 from utils.validators import PathValidator
@@ -9,6 +10,10 @@ from utils.validators import PathValidator
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 UPLOAD_DIR = os.path.join(BASE_DIR, "uploads")
 
+# Column types per file_path, shared by all worker threads
+_COLUMN_TYPES: dict[str, dict] = {}
+_COLUMN_TYPES_LOCK = threading.Lock()
+
 blp = Blueprint("Select and Categorize", __name__, url_prefix="/api",
                 description="Selecting columns and categorizing them")
 
@@ -48,17 +53,11 @@ class SelectFeatures(MethodView):
                 return jsonify({"error": error}), 400
 
             # Read dataset to validate columns exist
-            df = FileService.read_dataset(abs_path)
-            df_columns = FileService.get_columns(df)
-            df_col_set = set(df_columns)
+            df_columns = FileService.read_columns_only(abs_path)
+            df_col_set = frozenset(df_columns)
 
             # Normalize requested features to strings and dedupe preserving order
-            wanted = []
-            seen = set()
-            for c in [str(x) for x in selected]:
-                if c not in seen:
-                    seen.add(c)
-                    wanted.append(c)
+            wanted = list(dict.fromkeys(str(x) for x in selected))
 
             missing = [c for c in wanted if c not in df_col_set]
             if missing:
@@ -126,26 +125,12 @@ class SetColumnTypes(MethodView):
                 return jsonify({"error": error}), 400
 
             # Read dataset to validate column existence
-            df = FileService.read_dataset(abs_path)
-            df_columns = FileService.get_columns(df)
-            df_col_set = set(df_columns)
-
-            # Normalize provided column names to strings
-            cat_cols = [str(c) for c in categorical]
-            cont_cols = [str(c) for c in continuous]
-
-            # Dedupe while preserving order
-            def dedupe(seq):
-                seen = set()
-                out = []
-                for x in seq:
-                    if x not in seen:
-                        seen.add(x)
-                        out.append(x)
-                return out
-
-            cat_cols = dedupe(cat_cols)
-            cont_cols = dedupe(cont_cols)
+            df_columns = FileService.read_columns_only(abs_path)
+            df_col_set = frozenset(df_columns)
+
+            # Normalize provided column names to strings, dedupe preserving order
+            cat_cols = list(dict.fromkeys(str(c) for c in categorical))
+            cont_cols = list(dict.fromkeys(str(c) for c in continuous))
 
             # Validate existence
             missing_cat = [c for c in cat_cols if c not in df_col_set]
@@ -161,7 +146,7 @@ class SetColumnTypes(MethodView):
                 }), 400
 
             # Optional: warn on overlaps
-            overlaps = sorted(set(cat_cols).intersection(set(cont_cols)))
+            overlaps = sorted(set(cat_cols).intersection(cont_cols))
             if overlaps:
                 return jsonify({
                     "error": "Columns overlap between 'categorical' and 'continuous'.",
@@ -169,12 +154,11 @@ class SetColumnTypes(MethodView):
                 }), 400
 
             # Save temporarily in in-memory store keyed by file_path
-            store = current_app.config.get("COLUMN_TYPES_STORE", {})
-            store[file_path] = {
-                "categorical": cat_cols,
-                "continuous": cont_cols,
-            }
-            current_app.config["COLUMN_TYPES_STORE"] = store
+            with _COLUMN_TYPES_LOCK:
+                _COLUMN_TYPES[file_path] = {
+                    "categorical": cat_cols,
+                    "continuous": cont_cols,
+                }
 
             return jsonify({
                 "message": "Column types saved successfully.",
@@ -191,3 +175,16 @@ class SetColumnTypes(MethodView):
             return jsonify({"error": f"Invalid file format: {str(e)}"}), 400
         except Exception as e:
             return jsonify({"error": str(e)}), 400
+
+
+def get_column_types(file_path: str) -> dict:
+    """Get the column types saved for a dataset via /column-types.
+
+    Args:
+        file_path: Relative dataset path the types were saved under
+
+    Returns:
+        Dict with 'categorical' and 'continuous' lists, or {} if none were saved
+    """
+    with _COLUMN_TYPES_LOCK:
+        return _COLUMN_TYPES.get(file_path, {})
@@ -1,57 +1,185 @@
-from flask import request, jsonify
+from flask import Request, request, jsonify, current_app
 from flask.views import MethodView
 from flask_smorest import Blueprint
 import os
+import orjson
+import shutil
+import tempfile
+import time
 
 from services import FileService
 from utils.validators import FileValidator, PathValidator
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 UPLOAD_DIR = os.path.join(BASE_DIR, "uploads")
+# Created once at import instead of on every upload
+os.makedirs(UPLOAD_DIR, exist_ok=True)
+
+# Prefix/suffix of streamed multipart parts; parts this old are leftovers
+# of a process that died mid-upload
+_PART_PREFIX, _PART_SUFFIX = ".upload-", ".part"
+_STALE_PART_SECONDS = 3600
+
+
+def _remove_stale_parts() -> None:
+    """Delete streamed upload parts left behind by a dead process."""
+    cutoff = time.time() - _STALE_PART_SECONDS
+    with os.scandir(UPLOAD_DIR) as entries:
+        for entry in entries:
+            if entry.name.startswith(_PART_PREFIX) and entry.name.endswith(_PART_SUFFIX):
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                except OSError:
+                    pass  # Removed meanwhile, or still held open
+
+
+_remove_stale_parts()
 
 blp = Blueprint("Uploads", __name__, url_prefix="/api",
                 description="File upload and preview operations")
 
 
+class UploadRequest(Request):
+    """Request whose multipart file parts for /upload stream to disk in UPLOAD_DIR.
+
+    Parts go to named temporary files from the first byte instead of being
+    spooled in memory, so an upload can be moved into place with os.replace
+    rather than copied. Parts left unmoved are deleted when the request closes.
+    Other endpoints keep werkzeug's default in-memory/temporary streams.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._part_paths = []
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if self.endpoint != _UPLOAD_ENDPOINT:
+            return super()._get_file_stream(
+                total_content_length, content_type, filename, content_length)
+        stream = tempfile.NamedTemporaryFile(
+            "wb+", dir=UPLOAD_DIR, prefix=_PART_PREFIX, suffix=_PART_SUFFIX, delete=False)
+        self._part_paths.append(stream.name)
+        return stream
+
+    def close(self):
+        super().close()
+        for path in self._part_paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # Already moved into place
+
+
+def _save_stream(stream, target_path: str) -> None:
+    """
+    Copy a stream to target_path through a temp file in UPLOAD_DIR.
+
+    The finished file replaces target_path, so the old file (which may be
+    hard-linked as the working copy) is never written through, and an
+    aborted upload leaves it intact.
+    """
+    fd, tmp_path = tempfile.mkstemp(
+        dir=UPLOAD_DIR, prefix=_PART_PREFIX, suffix=_PART_SUFFIX)
+    try:
+        # 1 MiB blocks; peak memory is one block
+        with os.fdopen(fd, "wb") as f:
+            shutil.copyfileobj(stream, f, length=1 << 20)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, target_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+# Endpoint whose multipart parts UploadRequest streams to disk
+_UPLOAD_ENDPOINT = f"{blp.name}.UploadFile"
+
+
 @blp.route("/upload")
 class UploadFile(MethodView):
     def post(self):
         """Upload a dataset file (CSV or Excel) via multipart/form-data under key 'file'.
+        Large files can instead be sent as the raw request body with
+        Content-Type: application/octet-stream and the name in an X-Filename
+        header; the body is then copied straight to disk without multipart parsing.
         Creates two copies:
         1. original_<filename>.csv - Read-only original for reference
         2. working_<filename>.csv - Working copy for all operations
         """
         try:
-            # Validate form-data key and file presence
-            if "file" not in request.files:
-                return jsonify({"error": "No file part in the request. Expected form-data key 'file'."}), 400
-
-            file = request.files["file"]
-
-            # Validate filename presence
-            if not file.filename or file.filename == "":
-                return jsonify({"error": "No file selected for upload."}), 400
+            raw_upload = request.mimetype == "application/octet-stream"
+            if raw_upload:
+                raw_filename = request.headers.get("X-Filename", "")
+                if not raw_filename:
+                    return jsonify({"error": "Missing 'X-Filename' header for application/octet-stream upload."}), 400
+            else:
+                # Validate form-data key and file presence
+                if "file" not in request.files:
+                    return jsonify({"error": "No file part in the request. Expected form-data key 'file'."}), 400
+
+                file = request.files["file"]
+
+                # Validate filename presence
+                if not file.filename or file.filename == "":
+                    return jsonify({"error": "No file selected for upload."}), 400
+                raw_filename = file.filename
 
             # Validate and secure filename
-            filename, error = FileValidator.validate_filename(file.filename)
+            filename, error = FileValidator.validate_filename(raw_filename)
             if error:
                 return jsonify({"error": error}), 400
 
-            # Ensure uploads directory exists
-            os.makedirs(UPLOAD_DIR, exist_ok=True)
-
             # Save original file with 'original_' prefix
-            base_name = os.path.splitext(filename)[0]
-            extension = os.path.splitext(filename)[1]
+            base_name, extension = os.path.splitext(filename)
             original_filename = f"original_{base_name}{extension}"
             original_path = os.path.join(UPLOAD_DIR, original_filename)
-            file.save(original_path)
+            if raw_upload:
+                # Body goes to a temp file that then replaces the original
+                _save_stream(request.stream, original_path)
+            elif getattr(file.stream, "name", None) in getattr(request, "_part_paths", ()):
+                # Part already streamed to a temp file in UPLOAD_DIR: just rename
+                # it. The handle is closed first; Windows can't rename open files.
+                part_path = file.stream.name
+                file.stream.close()
+                os.chmod(part_path, 0o644)
+                try:
+                    os.replace(part_path, original_path)
+                except OSError:
+                    # E.g. the target is held open elsewhere: copy to a new
+                    # file instead of writing through the working copy's link
+                    if os.path.lexists(original_path):
+                        os.remove(original_path)
+                    shutil.copyfile(part_path, original_path)
+            else:
+                # Copy the multipart stream via a temp file, never in place
+                _save_stream(file.stream, original_path)
 
-            # Read the uploaded file and create working copy
-            df = FileService.read_dataset(original_path)
             working_filename = f"working_{base_name}.csv"
             working_path = os.path.join(UPLOAD_DIR, working_filename)
-            FileService.save_dataset(df, working_path, ensure_dir=True)
+            # A re-upload replaces both files; drop frames parsed from the old ones
+            FileService.invalidate(original_path)
+            FileService.invalidate(working_path)
+            if extension.lower() == ".csv":
+                # Already CSV: link (or kernel-copy) it instead of parse + rewrite.
+                # save_dataset replaces files atomically, so later edits to the
+                # working copy never write through to the original.
+                if os.path.lexists(working_path):
+                    os.remove(working_path)
+                try:
+                    os.link(original_path, working_path)
+                except OSError:
+                    shutil.copyfile(original_path, working_path)
+            else:
+                # Excel uploads need converting to a CSV working copy
+                df = FileService.read_dataset(original_path)
+                FileService.save_dataset(df, working_path, ensure_dir=True)
+
+            # Later reads (preview, detection, fixes) use the Parquet copy once written
+            FileService.schedule_parquet_copy(working_path)
 
             # Return both paths for client usage
             return jsonify({
@@ -81,21 +209,21 @@ class PreviewDataset(MethodView):
                 return jsonify({"error": "'file_path' is required in JSON body."}), 400
 
             # Validate path
-            abs_path, error = PathValidator.validate_upload_path(
+            abs_path, st, error = PathValidator.validate_upload_path_stat(
                 file_path, BASE_DIR, UPLOAD_DIR)
             if error:
                 return jsonify({"error": error}), 400
 
-            # Read dataset and get preview
-            df = FileService.read_dataset(abs_path)
-            preview_data = FileService.get_preview(df, rows=10)
-
-            # Add missing value counts for ALL rows (not just preview)
-            missing_values = df.isna().sum().to_dict()
-            preview_data['missing_values'] = {
-                k: int(v) for k, v in missing_values.items()}
+            # Preview rows plus missing value counts for ALL rows, without
+            # parsing the whole dataset
+            preview_data = FileService.preview_dataset(
+                abs_path, rows=10, st=st)
 
-            return jsonify(preview_data), 200
+            # orjson writes the row dicts in C; NaN/Inf become null as with
+            # the app's JSON provider, and datetimes are encoded natively
+            body = orjson.dumps(
+                preview_data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+            return current_app.response_class(body, mimetype="application/json"), 200
 
         except FileNotFoundError:
             return jsonify({"error": "File not found."}), 400
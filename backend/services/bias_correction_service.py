@@ -1,7 +1,9 @@
 """Bias correction service for categorical columns."""
+import numpy as np
 import pandas as pd
 from typing import Dict, Any, Optional
 from utils.transformers.categorical import CategoricalTransformer
+from utils.data_stats import bounded_nunique
 
 
 class BiasCorrectionService:
@@ -26,9 +28,10 @@ class BiasCorrectionService:
             return False, f"Target column '{target_col}' not found in dataset"
 
         y = df[target_col]
-        nunique = y.nunique(dropna=True)
+        # The dtype alone settles text/category/bool targets; only numeric
+        # ones need their classes counted, and only up to 20
         is_categorical = (str(y.dtype) in (
-            "object", "category", "bool")) or (nunique <= 20)
+            "object", "category", "bool")) or (bounded_nunique(y, cap=20) <= 20)
 
         if not is_categorical:
             return False, "Target column is not categorical"
@@ -41,7 +44,8 @@ class BiasCorrectionService:
         target_col: str,
         method: str,
         threshold: Optional[float] = None,
-        categorical_columns: Optional[list] = None
+        categorical_columns: Optional[list] = None,
+        smote_chunk_size: Optional[int] = None
     ) -> tuple[pd.DataFrame, Dict[str, Any]]:
         """
         Apply bias correction to a DataFrame.
@@ -52,6 +56,8 @@ class BiasCorrectionService:
             method: Correction method (oversample/undersample/smote/reweight)
             threshold: Optional threshold for sampling strategy
             categorical_columns: Optional list of categorical column names for SMOTE-NC
+            smote_chunk_size: Optional row chunk size for parallel SMOTE on very
+                large classes (see CategoricalTransformer.smote)
 
         Returns:
             Tuple of (corrected_dataframe, metadata_dict)
@@ -62,7 +68,8 @@ class BiasCorrectionService:
             try:
                 thr = float(threshold)
                 y = df[target_col].astype(str)
-                nunique = y.nunique(dropna=True)
+                # Branches only distinguish binary from multi-class
+                nunique = bounded_nunique(y, cap=2)
 
                 if 0 < thr <= 1:
                     if nunique == 2:
@@ -75,33 +82,32 @@ class BiasCorrectionService:
                         # - 0.5 = bring each class halfway toward majority
                         # - Preserves relative ordering of classes
                         value_counts = y.value_counts().sort_values(ascending=False)
-                        majority_count = value_counts.iloc[0]
-
-                        sampling_dict = {}
-                        for cls, count in value_counts.items():
-                            if count < majority_count:
-                                # Calculate how much to increase this class
-                                # target = current + (majority - current) * threshold
-                                target_count = int(
-                                    count + (majority_count - count) * thr)
-                                if target_count > count:
-                                    sampling_dict[cls] = target_count
+                        counts = value_counts.to_numpy()
+                        majority_count = counts[0]
+
+                        # Calculate how much to increase each class at once
+                        # target = current + (majority - current) * threshold
+                        targets = (
+                            counts + (majority_count - counts) * thr).astype(np.int64)
+                        grow = (counts < majority_count) & (targets > counts)
+                        sampling_dict = dict(zip(
+                            value_counts.index[grow].tolist(), targets[grow].tolist()))
 
                         if sampling_dict:
                             sampling_strategy = sampling_dict
                     elif nunique > 2 and method == "undersample":
                         # Multi-class undersampling: bring majority down proportionally
                         value_counts = y.value_counts()
-                        minority_count = value_counts.min()
+                        counts = value_counts.to_numpy()
+                        minority_count = counts.min()
 
-                        sampling_dict = {}
-                        for cls, count in value_counts.items():
-                            # Calculate target: minority / threshold
-                            # If threshold = 0.5, minority class becomes 0.5 of target majority
-                            target_count = int(minority_count / thr)
-                            # Only undersample classes above target
-                            if count > target_count:
-                                sampling_dict[cls] = target_count
+                        # Calculate target: minority / threshold
+                        # If threshold = 0.5, minority class becomes 0.5 of target majority
+                        target_count = int(minority_count / thr)
+                        # Only undersample classes above target
+                        shrink = counts > target_count
+                        sampling_dict = dict.fromkeys(
+                            value_counts.index[shrink].tolist(), target_count)
 
                         if sampling_dict:
                             sampling_strategy = sampling_dict
@@ -118,8 +124,8 @@ class BiasCorrectionService:
         # Apply correction based on method
         if method == "reweight":
             # Reweight doesn't modify the dataset
-            y = df[target_col].astype(str)
-            class_weights = CategoricalTransformer.compute_class_weights(y)
+            class_weights = CategoricalTransformer.compute_class_weights(
+                df[target_col])
             metadata["class_weights"] = class_weights
             return df.copy(), metadata
 
@@ -135,9 +141,12 @@ class BiasCorrectionService:
 
         elif method == "smote":
             df_corrected = CategoricalTransformer.smote(
-                df, target_col, sampling_strategy, categorical_columns=categorical_columns)
+                df, target_col, sampling_strategy, categorical_columns=categorical_columns,
+                chunk_size=smote_chunk_size)
             if categorical_columns:
                 metadata["categorical_columns"] = categorical_columns
+            if smote_chunk_size:
+                metadata["smote_chunk_size"] = smote_chunk_size
             return df_corrected, metadata
 
         else:
@@ -1,4 +1,5 @@
 """Bias detection service for categorical columns."""
+import numpy as np
 import pandas as pd
 from typing import Dict, List, Any
 
@@ -20,6 +21,8 @@ class BiasDetectionService:
         """
         result = {}
         df_columns = set(df.columns)
+        # Entries still waiting for a severity, and their imbalance ratios
+        pending, ratios = [], []
 
         for col in categorical_columns:
             col_entry = {}
@@ -30,37 +33,53 @@ class BiasDetectionService:
                 result[col] = col_entry
                 continue
 
-            series = df[col].dropna()
-            if series.empty:
+            series = df[col]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                series = series.dropna()
+                # value_counts also lists unused categories; keep its output
+                dist = series.value_counts(normalize=True)
+                keys, probs = dist.index, dist.to_numpy()
+            else:
+                # One hashing pass; a stable sort by count reproduces
+                # value_counts' order (ties by first appearance)
+                codes, uniques = pd.factorize(series)
+                counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+                order = np.argsort(-counts, kind="stable")
+                keys, probs = uniques.take(order), counts[order] / counts.sum()
+
+            if series.empty or len(keys) == 0:
                 col_entry["severity"] = "N/A"
                 col_entry["note"] = "No data"
                 result[col] = col_entry
                 continue
 
-            # Compute normalized distribution
-            dist = series.value_counts(normalize=True).to_dict()
-            dist_str = {str(k): float(round(v, 6)) for k, v in dist.items()}
+            # Compute normalized distribution: round and stringify in bulk
+            shares = np.round(probs, 6)
+            dist_str = dict(zip(keys.astype(str).tolist(), shares.tolist()))
 
             # Calculate imbalance ratio
             if len(dist_str) == 1:
                 ratio = 0.0  # Single class = maximum imbalance
             else:
-                majority = max(dist_str.values())
-                minority = min(dist_str.values())
-                ratio = (minority / majority) if majority > 0 else 0.0
-
-            # Assign severity
-            if ratio >= 0.5:
-                severity = "Low"
-            elif ratio >= 0.2:
-                severity = "Moderate"
-            else:
-                severity = "Severe"
-
-            # Merge distribution and severity
+                if len(dist_str) < len(shares):
+                    # Labels equal as strings (1 vs "1"): later shares won
+                    shares = np.fromiter(dist_str.values(), dtype=float)
+                majority = shares.max()
+                minority = shares.min()
+                ratio = float(minority / majority) if majority > 0 else 0.0
+
+            # Merge distribution; severity is assigned below for all columns at once
             col_entry.update(dist_str)
-            col_entry["severity"] = severity
             result[col] = col_entry
+            pending.append(col_entry)
+            ratios.append(ratio)
+
+        # Assign severity
+        ratios = np.asarray(ratios, dtype=float)
+        severities = np.select([ratios >= 0.5, ratios >= 0.2],
+                               ["Low", "Moderate"], "Severe")
+        for col_entry, severity in zip(pending, severities.tolist()):
+            col_entry["severity"] = severity
 
         return result
 
@@ -78,9 +97,17 @@ class BiasDetectionService:
         """
         y = df[target_col].astype(str)
 
-        counts = y.value_counts(dropna=False).to_dict()
-        distribution = y.value_counts(
-            normalize=True, dropna=False).round(6).astype(float).to_dict()
+        # One hashing pass; a stable sort by count reproduces value_counts'
+        # order (ties by first appearance)
+        codes, uniques = pd.factorize(y, use_na_sentinel=False)
+        class_counts = np.bincount(codes, minlength=len(uniques))
+        order = np.argsort(-class_counts, kind="stable")
+        labels = uniques.take(order).tolist()
+        class_counts = class_counts[order]
+
+        counts = dict(zip(labels, class_counts.tolist()))
+        distribution = dict(zip(
+            labels, np.round(class_counts / class_counts.sum(), 6).tolist()))
         total = int(len(y))
 
         return {
@@ -1,22 +1,532 @@
 """File handling service for reading and writing datasets."""
+import csv
+import gzip
+import io
+import mmap
 import os
+import shutil
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 
+try:
+    import pyarrow as pa
+    from pyarrow import compute as pc
+    from pyarrow import csv as pacsv
+    from pyarrow import parquet as pq
+except ImportError:  # Parquet copies and Arrow CSV parsing are skipped without pyarrow
+    pa = None
+    pc = None
+    pacsv = None
+    pq = None
+
+
+_SNIFF_CHARS = 64 << 10
+
+# CSVs with fewer lines than this are previewed from a full (cached) read
+_SMALL_CSV_LINES = 10_000
+_LINE_COUNT_CHUNK = 1 << 20
+
+# pandas' default NA markers ("None" and "<NA>" are missing from Arrow's list)
+_NA_VALUES = ["", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+              "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None",
+              "n/a", "nan", "null"]
+
+
+def _sniff_dialect(source: str):
+    """Sniff the CSV dialect from the first 64 KiB of whole lines, or None if unclear."""
+    with open(source, newline="", encoding="utf-8", errors="replace") as f:
+        sample = f.read(_SNIFF_CHARS)
+    # Drop a row cut off mid-way so it doesn't skew the per-line counts
+    if len(sample) == _SNIFF_CHARS and "\n" in sample:
+        sample = sample[:sample.rfind("\n")]
+    try:
+        return csv.Sniffer().sniff(sample)
+    except csv.Error:
+        return None
+
+
+def _pandas_csv_options(dialect) -> dict:
+    """pd.read_csv (C engine) keyword arguments for a sniffed dialect."""
+    if dialect is None:
+        return {}
+    return {"sep": dialect.delimiter, "skipinitialspace": dialect.skipinitialspace}
+
+
+def _read_csv_table(source: str, dialect=None, column_names: list[str] | None = None,
+                    include_columns: list[str] | None = None):
+    """
+    Parse a CSV into an Arrow table with pandas-like inference, or None to fall back.
+
+    Args:
+        source: Path to the CSV file
+        dialect: Sniffed csv dialect, or None for comma-separated
+        column_names: Names to use instead of the header row (which is skipped)
+        include_columns: Only parse these columns, in this order
+    """
+    # Arrow can't strip spaces after delimiters; pandas handles those files
+    if dialect is not None and dialect.skipinitialspace:
+        return None
+    try:
+        read_options = pacsv.ReadOptions(
+            use_threads=True, block_size=8 << 20, column_names=column_names,
+            skip_rows=1 if column_names is not None else 0)
+        parse_options = pacsv.ParseOptions(
+            delimiter=dialect.delimiter if dialect is not None else ",")
+        convert_options = pacsv.ConvertOptions(
+            null_values=_NA_VALUES, strings_can_be_null=True,
+            include_columns=include_columns)
+        table = pacsv.read_csv(source, read_options=read_options,
+                               parse_options=parse_options,
+                               convert_options=convert_options)
+
+        # Match pandas' inference: dates stay text, all-empty columns are float
+        column_types = {}
+        for field in table.schema:
+            if pa.types.is_temporal(field.type):
+                column_types[field.name] = pa.string()
+            elif pa.types.is_null(field.type):
+                column_types[field.name] = pa.float64()
+        if column_types:
+            convert_options.column_types = column_types
+            table = pacsv.read_csv(source, read_options=read_options,
+                                   parse_options=parse_options,
+                                   convert_options=convert_options)
+    except pa.ArrowException:
+        return None
+
+    # Blank or duplicate headers need pandas' "Unnamed: N" / "name.1" naming
+    names = table.column_names
+    if all(names) and len(set(names)) == len(names):
+        return table
+    return None
+
+
+def _read_csv(source: str, columns: frozenset | None = None) -> pd.DataFrame:
+    """Parse a CSV with pyarrow's multi-threaded reader, falling back to pandas."""
+    dialect = _sniff_dialect(source)
+    options = _pandas_csv_options(dialect)
+
+    names = include = positions = None
+    if columns is not None:
+        # pandas' header names ("Unnamed: N", "name.1") decide what matches
+        header = pd.read_csv(source, nrows=0, **options)
+        names = FileService.get_columns(header)
+        positions = [i for i, name in enumerate(names) if name in columns]
+        if not positions:
+            return header.iloc[:, []]
+        include = [names[i] for i in positions]
+
+    if pacsv is not None:
+        table = _read_csv_table(source, dialect, names, include)
+        if table is not None:
+            # One block per column: no consolidation copy into 2D blocks
+            return table.to_pandas(split_blocks=True, self_destruct=True)
+
+    # C engine with the sniffed separator instead of the Python-engine sniffer
+    return pd.read_csv(source, usecols=positions, **options)
+
+
+def _head_bytes(source: str, lines: int) -> bytes:
+    """Bytes of the first `lines` lines of a file, found via mmap without reading the rest."""
+    with open(source, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = 0
+            for _ in range(lines):
+                newline = mm.find(b"\n", end)
+                if newline == -1:
+                    end = len(mm)
+                    break
+                end = newline + 1
+            return mm[:end]
+
+
+def _count_lines(source: str, cap: int) -> int:
+    """Count newlines in a file via mmap, stopping once `cap` is reached."""
+    with open(source, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            buf = np.frombuffer(mm, dtype=np.uint8)
+            count = 0
+            try:
+                # Vectorized byte compare per 1 MiB window: no Python-level loop
+                # over lines, and big files stop after the first few windows
+                for start in range(0, size, _LINE_COUNT_CHUNK):
+                    count += int(np.count_nonzero(
+                        buf[start:start + _LINE_COUNT_CHUNK] == 0x0A))
+                    if count >= cap:
+                        return cap
+            finally:
+                # The mmap can't close while a NumPy view still exports it
+                del buf
+            return count
+
+
+def _scan_csv(source: str, dialect, n_columns: int, numeric: dict) -> tuple[list[int], dict]:
+    """
+    Stream a CSV once (one block in memory) for per-column missing counts.
+
+    Args:
+        source: Path to the CSV file
+        dialect: Sniffed csv dialect, or None for comma-separated
+        n_columns: Number of columns in the header
+        numeric: Column position -> Arrow type (int64/float64) inferred from the head
+
+    Returns:
+        (missing counts per column, column position -> type every value still
+        parses as: int64 may widen to float64, None means text)
+    """
+    names = [f"f{i}" for i in range(n_columns)]
+    reader = pacsv.open_csv(
+        source,
+        read_options=pacsv.ReadOptions(
+            column_names=names, skip_rows=1, block_size=8 << 20),
+        parse_options=pacsv.ParseOptions(
+            delimiter=dialect.delimiter if dialect is not None else ","),
+        # Everything as text: null detection needs no type inference across blocks
+        convert_options=pacsv.ConvertOptions(
+            column_types=dict.fromkeys(names, pa.string()),
+            null_values=_NA_VALUES, strings_can_be_null=True))
+    counts = [0] * n_columns
+    types = dict(numeric)
+    for batch in reader:
+        for i, column in enumerate(batch.columns):
+            counts[i] += column.null_count
+        for i, target in types.items():
+            while target is not None:
+                try:
+                    pc.cast(batch.column(i), target)
+                    break
+                except pa.ArrowInvalid:
+                    target = pa.float64() if pa.types.is_integer(target) else None
+            types[i] = target
+    return counts, types
+
+
+def _preview_csv(source: str, rows: int) -> dict | None:
+    """Preview a CSV from its first lines plus a streaming scan, or None to fall back."""
+    dialect = _sniff_dialect(source)
+    if dialect is not None and dialect.skipinitialspace:
+        return None
+    options = _pandas_csv_options(dialect)
+    try:
+        head = _head_bytes(source, rows + 1)
+        head_df = pd.read_csv(io.BytesIO(head), **options)
+        numeric = {
+            i: pa.int64() if pd.api.types.is_integer_dtype(dtype) else pa.float64()
+            for i, dtype in enumerate(head_df.dtypes)
+            if pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_float_dtype(dtype)
+        }
+        counts, types = _scan_csv(source, dialect, len(head_df.columns), numeric)
+
+        # Render the head with the dtypes a full read would infer
+        text_cols = [head_df.columns[i] for i, t in types.items() if t is None]
+        if text_cols:
+            head_df = pd.read_csv(io.BytesIO(head),
+                                  dtype=dict.fromkeys(text_cols, str), **options)
+    except (ValueError, pa.ArrowException):
+        # Quoted newlines in the head, ragged rows, empty files: use the full read
+        return None
+
+    for i, target in types.items():
+        # Integer columns with missing values are float64 in pandas too
+        if target is not None and (pa.types.is_floating(target) or counts[i]):
+            col = head_df.columns[i]
+            head_df[col] = head_df[col].astype("float64")
+
+    preview_data = FileService.get_preview(head_df, rows=rows)
+    preview_data["missing_values"] = dict(
+        zip(FileService.get_columns(head_df), counts))
+    return preview_data
+
+
+def _preview_parquet(source: str, rows: int) -> dict:
+    """Preview a Parquet file from its first batches and footer null statistics."""
+    parquet_file = pq.ParquetFile(source)
+    schema = parquet_file.schema_arrow
+
+    batches, n = [], 0
+    for batch in parquet_file.iter_batches(batch_size=rows):
+        batches.append(batch)
+        n += batch.num_rows
+        if n >= rows:
+            break
+    head = pa.Table.from_batches(batches, schema=schema).slice(0, rows)
+
+    metadata = parquet_file.metadata
+    missing_values = {}
+    for j, name in enumerate(schema.names):
+        total = 0
+        for i in range(metadata.num_row_groups):
+            stats = metadata.row_group(i).column(j).statistics
+            if stats is None or not stats.has_null_count:
+                # No statistics written: count this one column's nulls directly
+                total = parquet_file.read(columns=[name]).column(0).null_count
+                break
+            total += stats.null_count
+        missing_values[name] = total
+
+    return FileService.get_table_preview(head, rows=rows, missing_values=missing_values)
+
+
+def _read_source(source: str, columns: frozenset | None = None) -> pd.DataFrame:
+    """Parse a dataset file by extension, keeping only `columns` if given."""
+    ext = os.path.splitext(source)[1].lower()
+
+    if ext == ".parquet":
+        if columns is not None:
+            # Column chunks are stored separately: unselected ones are never read
+            columns = [name for name in pq.read_schema(source).names
+                       if name in columns]
+        return pd.read_parquet(source, engine="pyarrow", columns=columns)
+    elif ext == ".csv":
+        return _read_csv(source, columns)
+    elif ext in (".xls", ".xlsx"):
+        if columns is None:
+            return pd.read_excel(source)
+        header = pd.read_excel(source, nrows=0)
+        positions = [i for i, name in enumerate(FileService.get_columns(header))
+                     if name in columns]
+        if not positions:
+            return header.iloc[:, []]
+        return pd.read_excel(source, usecols=positions)
+    else:
+        raise ValueError(
+            f"Unsupported file type: {ext}. Only .csv, .xls, .xlsx are supported")
+
+
+def _downcast_integers(df: pd.DataFrame) -> pd.DataFrame:
+    """Replace int64 columns of `df` (in place) with the smallest integer type holding them."""
+    for i, dtype in enumerate(df.dtypes):
+        if pd.api.types.is_integer_dtype(dtype):
+            # Range-checked by pandas: every value is kept exactly; by position
+            # so duplicate column names are handled too
+            df.isetitem(i, pd.to_numeric(df.iloc[:, i], downcast="integer"))
+    return df
+
+
+def _stat(filepath: str) -> os.stat_result:
+    """os.stat that reports a missing dataset as FileNotFoundError with its path."""
+    try:
+        return os.stat(filepath)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found: {filepath}") from None
+
+
+# Schema metadata key of a Parquet copy recording the file version it was made from
+_SOURCE_VERSION_KEY = b"biasxplorer.source_version"
+
+
+def _source_version(st: os.stat_result) -> bytes:
+    """Version tag of a dataset file: inode, size and mtime."""
+    return f"{st.st_ino}:{st.st_size}:{st.st_mtime_ns}".encode()
+
+
+def _fresh_parquet_stat(filepath: str, st: os.stat_result) -> os.stat_result | None:
+    """
+    Stat of a dataset's Parquet copy if it was made from the file's current
+    version (stat `st`).
+
+    A copy strictly newer than the file is fresh. With equal mtimes (files
+    written within one timestamp tick) the version recorded in the copy's
+    footer decides, so a file rewritten right after its copy isn't shadowed.
+    """
+    if pa is None:
+        return None
+
+    parquet_path = FileService.parquet_path(filepath)
+    if parquet_path == filepath:
+        return None
+
+    try:
+        parquet_st = os.stat(parquet_path)
+    except OSError:
+        return None
+    if parquet_st.st_mtime_ns > st.st_mtime_ns:
+        return parquet_st
+    if parquet_st.st_mtime_ns < st.st_mtime_ns:
+        return None
+    try:
+        metadata = pq.read_schema(parquet_path).metadata or {}
+    except (OSError, pa.ArrowException):
+        return None
+    return parquet_st if metadata.get(_SOURCE_VERSION_KEY) == _source_version(st) else None
+
+
+# Parsed frames keyed by (path, mtime_ns, size, columns, downcast), least
+# recently used first; columns is None for whole files
+_DATASET_CACHE: OrderedDict[tuple[str, int, int, frozenset | None, bool], pd.DataFrame] = OrderedDict()
+_DATASET_CACHE_SIZE = 8
+_DATASET_CACHE_LOCK = threading.Lock()
+
+
+def _read_cached(source: str, mtime_ns: int, size: int,
+                 columns: frozenset | None = None, downcast: bool = False) -> pd.DataFrame:
+    """
+    Parse a dataset file once per version; edits change the key and miss.
+
+    Downcast frames are cached under their own key, so the integer
+    downcast is also paid once per version rather than per read.
+    """
+    key = (source, mtime_ns, size, columns, downcast)
+    full_key = (source, mtime_ns, size, None, downcast)
+    with _DATASET_CACHE_LOCK:
+        df = _DATASET_CACHE.get(key)
+        if df is not None:
+            _DATASET_CACHE.move_to_end(key)
+            return df
+        df = _DATASET_CACHE.get(full_key)
+        if df is not None:
+            # The whole file is already parsed: selecting columns is cheaper
+            _DATASET_CACHE.move_to_end(full_key)
+            return df.loc[:, df.columns.isin(list(columns))]
+
+    # Parse outside the lock so reads of other files aren't serialized
+    df = _read_source(source, columns)
+    if downcast:
+        _downcast_integers(df)
+
+    with _DATASET_CACHE_LOCK:
+        # Older versions of this file can never be hit again
+        for stale in [k for k in _DATASET_CACHE
+                      if k[0] == source and k[1:3] != (mtime_ns, size)]:
+            del _DATASET_CACHE[stale]
+        _DATASET_CACHE[key] = df
+        while len(_DATASET_CACHE) > _DATASET_CACHE_SIZE:
+            _DATASET_CACHE.popitem(last=False)
+    return df
+
+
+# Transcodes dataset files to Parquet off the request thread
+_PARQUET_WRITER = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="parquet-writer")
+
+
+def _write_parquet_copy(filepath: str) -> None:
+    """Store a Parquet copy of a dataset file for faster later reads."""
+    try:
+        FileService.save_parquet_copy(filepath)
+    except Exception as e:
+        # Reads simply keep using the CSV
+        print(f"Parquet copy of {filepath} skipped: {e}")
+
 
 class FileService:
     """Handles file I/O operations for datasets."""
 
     @staticmethod
-    def read_dataset(filepath: str) -> pd.DataFrame:
+    def read_dataset(filepath: str, st: os.stat_result | None = None,
+                     columns: list[str] | None = None, downcast: bool = False) -> pd.DataFrame:
         """
         Read a dataset from CSV or Excel file.
 
+        Parsed frames are cached per file version, so repeated reads of an
+        unchanged file skip parsing. Each call returns its own shallow copy;
+        adding or replacing columns on it does not affect the cached frame.
+
         Args:
             filepath: Absolute path to the file
+            st: os.stat of `filepath` if the caller already has it
+            columns: Only parse these columns (in file order); names the file
+                doesn't have are skipped. None reads every column.
+            downcast: Store integer columns in the smallest integer dtype that
+                holds them (e.g. int8), for read-only analysis; arithmetic on
+                such columns can overflow, so leave it off for transformations.
+                Downcast frames are cached separately from plain ones.
 
         Returns:
             pandas DataFrame
 
+        Raises:
+            ValueError: If file type is unsupported
+            FileNotFoundError: If file doesn't exist
+        """
+        if st is None:
+            st = _stat(filepath)
+
+        # Prefer an up-to-date Parquet sibling: no tokenizing and exact dtypes
+        source = filepath
+        parquet_st = _fresh_parquet_stat(filepath, st)
+        if parquet_st is not None:
+            source, st = FileService.parquet_path(filepath), parquet_st
+        df = _read_cached(source, st.st_mtime_ns, st.st_size,
+                          frozenset(columns) if columns is not None else None,
+                          downcast)
+        return df.copy(deep=False)
+
+    @staticmethod
+    def invalidate(filepath: str) -> None:
+        """
+        Drop cached frames of a dataset file and its Parquet copy.
+
+        Args:
+            filepath: Absolute path to the dataset file
+        """
+        sources = {filepath, FileService.parquet_path(filepath)}
+        with _DATASET_CACHE_LOCK:
+            for key in [k for k in _DATASET_CACHE if k[0] in sources]:
+                del _DATASET_CACHE[key]
+
+    @staticmethod
+    def preview_dataset(filepath: str, rows: int = 10, st: os.stat_result | None = None) -> dict:
+        """
+        Preview a dataset with whole-file missing counts, without loading it whole.
+
+        Parquet copies are previewed from their first row batches and footer
+        statistics; CSVs of 10,000 lines or more from their first lines plus a
+        streaming null count. Excel files, smaller CSVs and CSVs the streaming
+        reader can't handle use a full read.
+
+        Args:
+            filepath: Absolute path to the file
+            rows: Number of rows to include
+            st: os.stat of `filepath` if the caller already has it
+
+        Returns:
+            Dict with 'columns', 'preview' and 'missing_values' keys
+
+        Raises:
+            ValueError: If file type is unsupported
+            FileNotFoundError: If file doesn't exist
+        """
+        if st is None:
+            st = _stat(filepath)
+
+        if pa is not None:
+            if _fresh_parquet_stat(filepath, st) is not None:
+                return _preview_parquet(FileService.parquet_path(filepath), rows)
+            # Small CSVs are parsed whole, which also caches the frame for the
+            # analysis steps that follow; only large ones are streamed
+            if (os.path.splitext(filepath)[1].lower() == ".csv"
+                    and _count_lines(filepath, _SMALL_CSV_LINES) >= _SMALL_CSV_LINES):
+                preview_data = _preview_csv(filepath, rows)
+                if preview_data is not None:
+                    return preview_data
+
+        df = FileService.read_dataset(filepath, st=st)
+        preview_data = FileService.get_preview(df, rows=rows)
+        missing_values = df.isna().sum().to_dict()
+        preview_data["missing_values"] = {
+            k: int(v) for k, v in missing_values.items()}
+        return preview_data
+
+    @staticmethod
+    def read_columns_only(filepath: str) -> list[str]:
+        """
+        Read only the column names of a dataset, without loading any rows.
+
+        Args:
+            filepath: Absolute path to the file
+
+        Returns:
+            List of column names as strings
+
         Raises:
             ValueError: If file type is unsupported
             FileNotFoundError: If file doesn't exist
@@ -24,30 +534,211 @@ class FileService:
         if not os.path.exists(filepath):
             raise FileNotFoundError(f"File not found: {filepath}")
 
+        # A fresh Parquet copy stores the names in its footer: no text to sniff
+        parquet_path = FileService.fresh_parquet_path(filepath)
+        if parquet_path:
+            return list(map(str, pq.read_schema(parquet_path).names))
+
         ext = os.path.splitext(filepath)[1].lower()
 
         if ext == ".csv":
-            return pd.read_csv(filepath, sep=None, engine='python')
+            header = pd.read_csv(
+                filepath, nrows=0, **_pandas_csv_options(_sniff_dialect(filepath)))
         elif ext in (".xls", ".xlsx"):
-            return pd.read_excel(filepath)
+            header = pd.read_excel(filepath, nrows=0)
         else:
             raise ValueError(
                 f"Unsupported file type: {ext}. Only .csv, .xls, .xlsx are supported")
+        return FileService.get_columns(header)
 
     @staticmethod
-    def save_dataset(df: pd.DataFrame, filepath: str, ensure_dir: bool = True) -> None:
+    def save_dataset(df: pd.DataFrame, filepath: str, ensure_dir: bool = True,
+                     chunksize: int = 100_000, gzip_copy: bool = False) -> None:
         """
         Save a DataFrame to CSV file.
 
+        The file is written next to the target and swapped in with os.replace,
+        so a path that is a hard link to another file (e.g. a working copy
+        linked to its upload) gets a new inode instead of rewriting both.
+
         Args:
             df: DataFrame to save
             filepath: Absolute path where to save
             ensure_dir: Create directory if it doesn't exist
+            chunksize: Rows formatted per to_csv batch
+            gzip_copy: Also write a <file>.gz companion for compressed downloads
         """
         if ensure_dir:
             os.makedirs(os.path.dirname(filepath), exist_ok=True)
 
-        df.to_csv(filepath, index=False)
+        tmp_path = f"{filepath}.tmp"
+        try:
+            # 1 MiB userspace buffer so rows reach the OS in large writes
+            with open(tmp_path, "w", newline="", encoding="utf-8", buffering=1 << 20) as f:
+                df.to_csv(f, index=False, chunksize=chunksize)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        os.replace(tmp_path, filepath)
+
+        if gzip_copy:
+            FileService.save_gzip(filepath)
+
+    @staticmethod
+    def parquet_path(filepath: str) -> str:
+        """Get the path of the Parquet copy stored next to a dataset file."""
+        return os.path.splitext(filepath)[0] + ".parquet"
+
+    @staticmethod
+    def fresh_parquet_path(filepath: str) -> str | None:
+        """
+        Get the Parquet copy of a dataset if it was made from the file's current version.
+
+        Args:
+            filepath: Absolute path to the dataset file
+
+        Returns:
+            Path of the Parquet copy, or None if it is missing or stale
+        """
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            return None
+        if _fresh_parquet_stat(filepath, st) is None:
+            return None
+        return FileService.parquet_path(filepath)
+
+    @staticmethod
+    def save_parquet(df: pd.DataFrame, filepath: str, source_stat: os.stat_result | None = None) -> str | None:
+        """
+        Save a Snappy-compressed Parquet copy of a dataset next to its file.
+
+        Args:
+            df: DataFrame as parsed from `filepath` (with the dtypes a read of
+                the file infers; see save_parquet_copy)
+            filepath: Absolute path of the dataset the copy belongs to
+            source_stat: os.stat of `filepath` taken before `df` was read; the
+                copy is discarded if the file has changed since. Without it,
+                `df` is taken to be the file as it is now (just saved).
+
+        Returns:
+            Path of the Parquet copy, or None if it could not be written
+        """
+        if pa is None:
+            return None
+
+        parquet_path = FileService.parquet_path(filepath)
+        tmp_path = f"{parquet_path}.tmp"
+        version = _source_version(
+            source_stat if source_stat is not None else os.stat(filepath))
+        try:
+            # Same table as df.to_parquet(index=False), plus the file version
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            table = table.replace_schema_metadata(
+                {**(table.schema.metadata or {}), _SOURCE_VERSION_KEY: version})
+            pq.write_table(table, tmp_path, compression="snappy")
+        except (pa.ArrowException, TypeError, ValueError):
+            # Mixed-type object columns or non-string headers can't be stored
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return None
+
+        if source_stat is not None:
+            st = os.stat(filepath)
+            if (st.st_ino, st.st_size, st.st_mtime_ns) != (
+                    source_stat.st_ino, source_stat.st_size, source_stat.st_mtime_ns):
+                # Rewritten while we were transcoding: this copy is already stale
+                os.remove(tmp_path)
+                return None
+
+        # Atomic swap so concurrent readers never see a partial file
+        os.replace(tmp_path, parquet_path)
+        return parquet_path
+
+    @staticmethod
+    def save_parquet_copy(filepath: str) -> str | None:
+        """
+        Save a Parquet copy of a dataset file from the file as it is parsed.
+
+        The copy is built from a fresh read of the file rather than from an
+        in-memory frame, so its dtypes are the ones a read of the file infers
+        (an object column cleaned of '?' markers is stored as the float64
+        column the CSV gives, not as object).
+
+        Args:
+            filepath: Absolute path of the dataset file
+
+        Returns:
+            Path of the Parquet copy, or None if it could not be written
+        """
+        st = _stat(filepath)
+        df = FileService.read_dataset(filepath, st=st)
+        return FileService.save_parquet(df, filepath, source_stat=st)
+
+    @staticmethod
+    def schedule_parquet_copy(filepath: str) -> Future:
+        """
+        Write a dataset file's Parquet copy on a background thread.
+
+        Until it is written, reads use the file itself (a copy made from an
+        older version is never preferred).
+
+        Args:
+            filepath: Absolute path of the dataset file
+
+        Returns:
+            Future of the background write
+        """
+        return _PARQUET_WRITER.submit(_write_parquet_copy, filepath)
+
+    @staticmethod
+    def gzip_path(filepath: str) -> str:
+        """Get the path of the gzip companion stored next to a dataset file."""
+        return f"{filepath}.gz"
+
+    @staticmethod
+    def fresh_gzip_path(filepath: str) -> str | None:
+        """
+        Get the gzip companion of a file if it is at least as new as the file.
+
+        Args:
+            filepath: Absolute path to the dataset file
+
+        Returns:
+            Path of the gzip companion, or None if it is missing or stale
+        """
+        gzip_path = FileService.gzip_path(filepath)
+        try:
+            if os.stat(gzip_path).st_mtime_ns >= os.stat(filepath).st_mtime_ns:
+                return gzip_path
+        except OSError:
+            pass
+        return None
+
+    @staticmethod
+    def save_gzip(filepath: str) -> str:
+        """
+        Write a gzip companion (<file>.gz) of a file for Content-Encoding: gzip.
+
+        Args:
+            filepath: Absolute path of the file to compress
+
+        Returns:
+            Path of the gzip companion
+        """
+        gzip_path = FileService.gzip_path(filepath)
+        tmp_path = f"{gzip_path}.tmp"
+        try:
+            # Level 1 compresses CSV text well at close to copy speed
+            with open(filepath, "rb") as src, gzip.open(tmp_path, "wb", compresslevel=1) as dst:
+                shutil.copyfileobj(src, dst, length=1 << 20)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        os.replace(tmp_path, gzip_path)
+        return gzip_path
 
     @staticmethod
     def get_preview(df: pd.DataFrame, rows: int = 10) -> dict:
@@ -64,9 +755,22 @@ class FileService:
         import numpy as np
 
         head_df = df.head(rows)
+        columns = list(map(str, head_df.columns.tolist()))
+
+        if pa is not None and head_df.columns.is_unique:
+            try:
+                # One Arrow pass yields JSON-ready rows with nulls already None
+                batch = pa.RecordBatch.from_pandas(head_df, preserve_index=False)
+                return {
+                    "columns": columns,
+                    "preview": batch.to_pylist()
+                }
+            except (pa.ArrowException, TypeError, ValueError):
+                # Mixed-type object columns: render them through pandas below
+                pass
+
         # Replace NaN/NaT with None for JSON compatibility
         clean_df = head_df.replace({np.nan: None, pd.NaT: None})
-        columns = list(map(str, clean_df.columns.tolist()))
         preview_records = clean_df.to_dict(orient="records")
 
         return {
@@ -74,6 +778,38 @@ class FileService:
             "preview": preview_records
         }
 
+    @staticmethod
+    def get_table_preview(table, rows: int = 10, missing_values: dict | None = None) -> dict:
+        """
+        Get preview of a pyarrow Table, with missing counts from its null metadata.
+
+        Args:
+            table: pyarrow Table to preview
+            rows: Number of rows to include
+            missing_values: Known per-column missing counts, when `table` holds
+                only part of the dataset
+
+        Returns:
+            Dict with 'columns', 'preview' and 'missing_values' keys
+        """
+        if missing_values is None:
+            # Arrow keeps per-chunk null counts, so no boolean mask is built
+            missing_values = {
+                name: table.column(name).null_count for name in table.column_names}
+
+        head = table.slice(0, rows)
+        # pandas holds integer columns with nulls as float64; render the head alike
+        for i, field in enumerate(head.schema):
+            if pa.types.is_integer(field.type) and missing_values.get(field.name):
+                head = head.set_column(
+                    i, field.name, head.column(i).cast(pa.float64()))
+
+        return {
+            "columns": head.column_names,
+            "preview": head.to_pylist(),
+            "missing_values": missing_values
+        }
+
     @staticmethod
     def get_columns(df: pd.DataFrame) -> list[str]:
         """Get list of column names from DataFrame."""
@@ -1,21 +1,26 @@
 """Skewness correction service for continuous columns."""
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 from typing import Dict, Any, List
-from utils.data_stats import compute_skewness
-from utils.transformers.continuous import ContinuousTransformer
+from utils.data_stats import compute_skewness, compute_skewness_columns, column_blocks
+from utils.transformers.continuous import ContinuousTransformer, ELEMENTWISE_METHODS
 
 
 class SkewnessCorrectionService:
     """Service for correcting skewness in continuous data."""
 
     @staticmethod
-    def correct_column(df: pd.DataFrame, column: str) -> Dict[str, Any]:
+    def correct_column(df: pd.DataFrame, column: str,
+                       original_skewness: float | None = None) -> Dict[str, Any]:
         """
         Correct skewness in a single column.
 
         Args:
             df: Input DataFrame (will be modified in place)
             column: Column name to correct
+            original_skewness: Skewness of the column if already computed
 
         Returns:
             Dictionary with transformation results
@@ -30,8 +35,9 @@ class SkewnessCorrectionService:
 
         try:
             # Compute original skewness
-            original_series = df[column].copy()
-            original_skewness = compute_skewness(original_series)
+            # compute_skewness only reads the column, so no copy is needed
+            if original_skewness is None:
+                original_skewness = compute_skewness(df[column])
 
             if original_skewness is None:
                 return {
@@ -79,12 +85,71 @@ class SkewnessCorrectionService:
         Returns:
             Tuple of (corrected_dataframe, transformation_results)
         """
-        df_corrected = df.copy()
+        # Shallow copy: every transformation assigns a new column array rather
+        # than writing into the existing one, so the caller's frame is untouched
+        df_corrected = df.copy(deep=False)
         transformations = {}
 
+        # Repeated columns must be corrected one after another
+        if len(columns) < 4 or len(set(columns)) < len(columns):
+            for col in columns:
+                result = SkewnessCorrectionService.correct_column(
+                    df_corrected, col)
+                transformations[col] = result
+            return df_corrected, transformations
+
+        # Original skewness of all numeric columns in vectorized blocks
+        original = compute_skewness_columns(df_corrected, columns)
+
+        # Float64 columns needing the same elementwise method are transformed
+        # together in blocks of bounded cell count; their new skewness is
+        # computed per block too
+        blocks = {}
         for col in columns:
-            result = SkewnessCorrectionService.correct_column(
-                df_corrected, col)
-            transformations[col] = result
-
-        return df_corrected, transformations
+            skew = original.get(col)
+            if skew is not None and abs(skew) > 0.5 and df_corrected[col].dtype == np.float64:
+                method = ContinuousTransformer.get_transformation_method(skew)
+                if method in ELEMENTWISE_METHODS:
+                    blocks.setdefault(method, []).append(col)
+        for method, method_columns in blocks.items():
+            for block_columns in column_blocks(method_columns, len(df_corrected)):
+                transformed = ContinuousTransformer.apply_elementwise_block(
+                    df_corrected, block_columns, method)
+                new = compute_skewness_columns(transformed, block_columns)
+                # Columns left with fewer than 2 values go through correct_column
+                # below, which reports them as before
+                done = [col for col in block_columns if col in new]
+                if done:
+                    df_corrected[done] = transformed[done]
+                for col in done:
+                    transformations[col] = {
+                        "original_skewness": float(original[col]),
+                        "new_skewness": float(new[col]),
+                        "method": method
+                    }
+        remaining = [col for col in columns if col not in transformations]
+
+        def correct_part(col):
+            # Each worker transforms its own one-column frame; the shared
+            # frame is only written from this thread once all are done. A
+            # shallow copy is its own frame (no SettingWithCopyWarning), and
+            # the transforms replace the column rather than write into it
+            if col in df_corrected.columns:
+                part = df_corrected[[col]].copy(deep=False)
+            else:
+                part = df_corrected.iloc[:, :0].copy(deep=False)
+            return part, SkewnessCorrectionService.correct_column(
+                part, col, original.get(col))
+
+        if remaining:
+            max_workers = min(len(remaining), os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(correct_part, remaining))
+
+            for col, (part, result) in zip(remaining, results):
+                if col in part.columns:
+                    df_corrected[col] = part[col]
+                transformations[col] = result
+
+        # Results in the requested column order
+        return df_corrected, {col: transformations[col] for col in columns}
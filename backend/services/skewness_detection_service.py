@@ -1,7 +1,7 @@
 """Skewness detection service for continuous columns."""
 import pandas as pd
 from typing import Dict, Any
-from utils.data_stats import compute_skewness
+from utils.data_stats import compute_moments
 
 
 class SkewnessDetectionService:
@@ -25,10 +25,8 @@ class SkewnessDetectionService:
         if column not in df.columns:
             raise ValueError(f"Column '{column}' not found in dataset")
 
-        series = df[column]
-        n_nonnull = series.notna().sum()
-
-        skewness = compute_skewness(series)
+        # Count and skewness share one pass over the column's values
+        n_nonnull, skewness = compute_moments(df[column])
 
         return {
             "column": column,
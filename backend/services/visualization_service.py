@@ -1,9 +1,232 @@
 """Visualization service for generating charts."""
-from utils.data_stats import compute_skewness
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from functools import lru_cache
+from utils.data_stats import skewness_from_array
 from typing import Dict, List
+import numpy as np
 import pandas as pd
+import orjson
 import plotly.graph_objects as go
-import json
+
+
+# Bins of the continuous-distribution histograms
+_HISTOGRAM_BINS = 30
+
+# Rendered chart JSON keyed by (kind, title, extra, data digest), and whole
+# skewness results keyed by file versions; least recently used first
+_CHART_CACHE: OrderedDict[tuple, str | dict] = OrderedDict()
+_CHART_CACHE_SIZE = 256
+_CHART_CACHE_LOCK = threading.Lock()
+
+
+def _series_digest(series: pd.Series) -> bytes:
+    """Digest of a Series' values and dtype (not its index or name)."""
+    hashes = pd.util.hash_pandas_object(series, index=False).to_numpy()
+    digest = hashlib.blake2b(hashes.tobytes(), digest_size=16)
+    digest.update(str(series.dtype).encode())
+    return digest.digest()
+
+
+def _cached_chart(key: tuple) -> str | dict | None:
+    """Chart JSON rendered earlier for `key`, or None."""
+    with _CHART_CACHE_LOCK:
+        chart = _CHART_CACHE.get(key)
+        if chart is not None:
+            _CHART_CACHE.move_to_end(key)
+        return chart
+
+
+def _store_chart(key: tuple, chart: str | dict) -> str | dict:
+    """Remember rendered chart JSON for `key` and return it."""
+    with _CHART_CACHE_LOCK:
+        _CHART_CACHE[key] = chart
+        _CHART_CACHE.move_to_end(key)
+        while len(_CHART_CACHE) > _CHART_CACHE_SIZE:
+            _CHART_CACHE.popitem(last=False)
+    return chart
+
+
+def _array_digest(values: np.ndarray) -> bytes:
+    """Digest of a float64 array's values."""
+    return hashlib.blake2b(
+        np.ascontiguousarray(values).tobytes(), digest_size=16).digest()
+
+
+def _numeric_array(series: pd.Series) -> np.ndarray:
+    """Non-NA numeric values of a column as float64; numeric columns skip to_numeric."""
+    if series.dtype.kind not in "fiub":
+        series = pd.to_numeric(series, errors='coerce')
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    missing = np.isnan(values)
+    # Boolean indexing copies even when nothing is missing
+    return values[~missing] if missing.any() else values
+
+
+def _dumps(obj) -> str:
+    """Encode a figure dict as JSON text with orjson (NumPy arrays handled in C)."""
+    return orjson.dumps(
+        obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+
+
+@lru_cache(maxsize=None)
+def _categorical_layout() -> dict:
+    """Layout of the bar charts (all but the title text), validated once."""
+    fig = go.Figure()
+    fig.update_layout(
+        title=dict(font=dict(size=16, weight='bold')),
+        xaxis_title="Class",
+        yaxis_title="Proportion",
+        yaxis=dict(range=[0, 1], tickformat='.0%'),
+        plot_bgcolor='white',
+        height=400,
+        margin=dict(l=50, r=50, t=60, b=50),
+        hovermode='closest'
+    )
+    fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='#E2E8F0')
+    fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='#E2E8F0')
+    return fig.to_dict()["layout"]
+
+
+@lru_cache(maxsize=None)
+def _continuous_layout() -> dict:
+    """Layout of the histogram charts (all but the title text), validated once."""
+    fig = go.Figure()
+    fig.update_layout(
+        title=dict(font=dict(size=14, weight='bold')),
+        xaxis_title="Value",
+        yaxis_title="Density",
+        plot_bgcolor='white',
+        height=450,
+        margin=dict(l=50, r=50, t=80, b=50),
+        hovermode='closest',
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
+    )
+    fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='#E2E8F0')
+    fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='#E2E8F0')
+    return fig.to_dict()["layout"]
+
+
+def _figure_dict(traces: list, layout: dict, title: str) -> dict:
+    """
+    Figure dict of `traces` on a prebuilt layout with the given title text.
+
+    Only the traces are validated per chart; the template-laden layout is
+    shared (it is only read when serializing).
+    """
+    # The empty "none" template set through layout= is in place before the
+    # figure initializes, so plotly skips building and deep-copying the
+    # default template (layout_template=None only clears it afterwards)
+    data = go.Figure(data=traces, layout={"template": "none"}).to_dict()["data"]
+    layout = dict(layout)
+    layout["title"] = {**layout["title"], "text": title}
+    return {"data": data, "layout": layout}
+
+
+def _fft_kde(x: np.ndarray, points: np.ndarray, n_grid: int = 512) -> np.ndarray:
+    """
+    Gaussian KDE of `x` evaluated at `points`, via linear binning and FFT convolution.
+
+    Uses Scott's bandwidth like scipy.stats.gaussian_kde, but costs
+    O(N + G log G) for a G-point grid instead of O(N * len(points)).
+
+    Args:
+        x: 1-D array of finite values
+        points: Positions to evaluate the density at
+        n_grid: Minimum number of grid points
+
+    Returns:
+        Density values at `points`
+
+    Raises:
+        ValueError: If `x` has fewer than 2 values or zero variance
+    """
+    x = np.asarray(x, dtype=np.float64)
+    n = x.size
+    bw = x.std(ddof=1) * n ** (-1 / 5) if n > 1 else 0.0
+    if not bw > 0:
+        raise ValueError("Cannot estimate density of a constant column")
+
+    lo = x.min() - 4 * bw
+    hi = x.max() + 4 * bw
+    # At least two grid points per bandwidth so the kernel is well sampled
+    n_grid = int(min(max(n_grid, np.ceil((hi - lo) / (bw / 2))), 1 << 14))
+    delta = (hi - lo) / (n_grid - 1)
+
+    # Linear binning: each value splits its weight between its two neighbours
+    pos = (x - lo) / delta
+    idx = np.minimum(pos.astype(np.intp), n_grid - 2)
+    frac = pos - idx
+    counts = (np.bincount(idx, weights=1 - frac, minlength=n_grid)
+              + np.bincount(idx + 1, weights=frac, minlength=n_grid))[:n_grid]
+
+    # Kernel out to 8 bandwidths (beyond that it is below 1e-14 of its peak),
+    # so the FFT only spans the grid plus that margin instead of three grids;
+    # zero padding keeps the convolution linear
+    half = int(min(n_grid - 1, np.ceil(8 * bw / delta)))
+    offsets = np.arange(-half, half + 1) * delta
+    kernel = np.exp(-0.5 * (offsets / bw) ** 2) / (bw * np.sqrt(2 * np.pi))
+    size = 1 << int(np.ceil(np.log2(n_grid + 2 * half)))
+    conv = np.fft.irfft(np.fft.rfft(counts, size) * np.fft.rfft(kernel, size), size)
+    density = np.maximum(conv[half:half + n_grid], 0) / n
+
+    grid = lo + delta * np.arange(n_grid)
+    return np.interp(points, grid, density)
+
+
+def _continuous_chart(values: np.ndarray, title: str, skew_val: float | None) -> str:
+    """Histogram + KDE chart JSON for non-NA float64 values."""
+    # Same data, title and skewness render the same figure: skip the rebuild
+    key = ("continuous", title, skew_val, _array_digest(values))
+    chart = _cached_chart(key)
+    if chart is not None:
+        return chart
+
+    # Histogram binned here over every value and drawn as bars, so the
+    # browser gets 30 densities instead of the raw values to bin
+    density, edges = np.histogram(values, bins=_HISTOGRAM_BINS, density=True)
+    histogram = go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=density,
+        width=np.diff(edges),
+        name='Histogram',
+        marker=dict(
+            color='#4C78A8',
+            line=dict(color='#2C5282', width=1)
+        ),
+        opacity=0.7,
+        hovertemplate='Value: %{x}<br>Density: %{y:.4f}<extra></extra>'
+    )
+
+    # KDE line from a binned FFT estimate (linear in N: uses every value)
+    x_range = np.linspace(values.min(), values.max(), 200)
+    kde_values = _fft_kde(values, x_range)
+
+    kde_line = go.Scatter(
+        x=x_range,
+        y=kde_values,
+        mode='lines',
+        name='KDE',
+        line=dict(color='red', width=2),
+        hovertemplate='Value: %{x:.2f}<br>Density: %{y:.4f}<extra></extra>'
+    )
+
+    title_with_skew = f"{title}<br>Skewness: {skew_val:.3f}" if skew_val is not None else title
+    fig = _figure_dict([histogram, kde_line],
+                       _continuous_layout(), title_with_skew)
+
+    # Return as JSON
+    return _store_chart(key, _dumps(fig))
 
 
 class VisualizationService:
@@ -21,15 +244,28 @@ class VisualizationService:
         Returns:
             JSON string with Plotly figure data
         """
-        dist = series.value_counts(normalize=True).sort_index()
-
-        # Convert to Python native types to avoid JSON serialization issues
-        x_values = [str(x) for x in dist.index.tolist()]
-        y_values = [float(y) for y in dist.values.tolist()]
-        text_values = [f"{v:.2%}" for v in y_values]
+        # Same data and title render the same figure: skip the rebuild
+        key = ("categorical", title, None, _series_digest(series))
+        chart = _cached_chart(key)
+        if chart is not None:
+            return chart
+
+        # Count on integer codes instead of value_counts + sort_index: the
+        # categories (unused ones included) or the sorted uniques give the order
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+        else:
+            codes, uniques = pd.factorize(series, sort=True)
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+
+        # Labels as strings; proportions stay a float64 array, which plotly
+        # serializes as a base64 typed array instead of a list of decimals
+        x_values = uniques.astype(str).tolist()
+        y_values = counts / counts.sum()
+        text_values = [f"{v:.2%}" for v in y_values.tolist()]
 
         # Create interactive bar chart with Plotly
-        fig = go.Figure(data=[
+        fig = _figure_dict([
             go.Bar(
                 x=x_values,
                 y=y_values,
@@ -43,24 +279,10 @@ class VisualizationService:
                               'Proportion: %{y:.2%}<br>' +
                               '<extra></extra>'
             )
-        ])
-
-        fig.update_layout(
-            title=dict(text=title, font=dict(size=16, weight='bold')),
-            xaxis_title="Class",
-            yaxis_title="Proportion",
-            yaxis=dict(range=[0, 1], tickformat='.0%'),
-            plot_bgcolor='white',
-            height=400,
-            margin=dict(l=50, r=50, t=60, b=50),
-            hovermode='closest'
-        )
-
-        fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='#E2E8F0')
-        fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='#E2E8F0')
+        ], _categorical_layout(), title)
 
         # Return as JSON
-        return json.dumps(fig.to_dict())
+        return _store_chart(key, _dumps(fig))
 
     @staticmethod
     def visualize_categorical_bias(
@@ -110,72 +332,15 @@ class VisualizationService:
         Returns:
             JSON string with Plotly figure data
         """
-        from scipy import stats
-        import numpy as np
-
-        # Create histogram
-        fig = go.Figure()
-
-        # Add histogram
-        fig.add_trace(go.Histogram(
-            x=series,
-            nbinsx=30,
-            name='Histogram',
-            marker=dict(
-                color='#4C78A8',
-                line=dict(color='#2C5282', width=1)
-            ),
-            opacity=0.7,
-            histnorm='probability density',
-            hovertemplate='Value: %{x}<br>Density: %{y:.4f}<extra></extra>'
-        ))
-
-        # Add KDE line using scipy
-        kde = stats.gaussian_kde(series)
-        x_range = np.linspace(series.min(), series.max(), 200)
-        kde_values = kde(x_range)
-
-        fig.add_trace(go.Scatter(
-            x=x_range,
-            y=kde_values,
-            mode='lines',
-            name='KDE',
-            line=dict(color='red', width=2),
-            hovertemplate='Value: %{x:.2f}<br>Density: %{y:.4f}<extra></extra>'
-        ))
-
-        # Update layout
-        title_with_skew = f"{title}<br>Skewness: {skew_val:.3f}" if skew_val is not None else title
-        fig.update_layout(
-            title=dict(text=title_with_skew,
-                       font=dict(size=14, weight='bold')),
-            xaxis_title="Value",
-            yaxis_title="Density",
-            plot_bgcolor='white',
-            height=450,
-            margin=dict(l=50, r=50, t=80, b=50),
-            hovermode='closest',
-            showlegend=True,
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
-            )
-        )
-
-        fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='#E2E8F0')
-        fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='#E2E8F0')
-
-        # Return as JSON
-        return json.dumps(fig.to_dict())
+        return _continuous_chart(
+            series.to_numpy(dtype=np.float64), title, skew_val)
 
     @staticmethod
     def visualize_skewness(
         df_before: pd.DataFrame,
         df_after: pd.DataFrame,
-        columns: List[str]
+        columns: List[str],
+        versions: tuple | None = None
     ) -> Dict[str, Dict]:
         """
         Create before/after charts for skewness correction.
@@ -184,54 +349,65 @@ class VisualizationService:
             df_before: Original DataFrame
             df_after: Corrected DataFrame
             columns: List of column names to visualize
+            versions: Optional (path, mtime_ns, size) of the before and after
+                files; when given, the whole result is cached under them
 
         Returns:
             Dictionary mapping column names to chart data
         """
-        charts = {}
-
-        for col in columns:
+        if versions is not None:
+            # Unchanged files and columns: reuse the previous response
+            key = ("skewness", versions, tuple(columns))
+            charts = _cached_chart(key)
+            if charts is not None:
+                return charts
+
+        def column_charts(col):
             if col not in df_before.columns:
-                charts[col] = {
-                    "error": f"Column '{col}' not found in before dataset"}
-                continue
+                return {"error": f"Column '{col}' not found in before dataset"}
 
             if col not in df_after.columns:
-                charts[col] = {
-                    "error": f"Column '{col}' not found in after dataset"}
-                continue
+                return {"error": f"Column '{col}' not found in after dataset"}
 
             try:
-                # Get data and convert to numeric
-                series_before = pd.to_numeric(
-                    df_before[col], errors='coerce').dropna()
-                series_after = pd.to_numeric(
-                    df_after[col], errors='coerce').dropna()
+                # Clean each column once into a float64 array; the skewness
+                # and the chart both read it
+                values_before = _numeric_array(df_before[col])
+                values_after = _numeric_array(df_after[col])
 
-                if series_before.empty or series_after.empty or len(series_before) < 2 or len(series_after) < 2:
-                    charts[col] = {"error": "Insufficient data"}
-                    continue
+                if len(values_before) < 2 or len(values_after) < 2:
+                    return {"error": "Insufficient data"}
 
                 # Compute skewness
-                before_skew = compute_skewness(series_before)
-                after_skew = compute_skewness(series_after)
+                before_skew = skewness_from_array(values_before)
+                after_skew = skewness_from_array(values_after)
 
                 # Create charts
-                before_json = VisualizationService.plot_continuous_distribution(
-                    series_before, f"Before: {col}", before_skew
-                )
-                after_json = VisualizationService.plot_continuous_distribution(
-                    series_after, f"After: {col}", after_skew
-                )
-
-                charts[col] = {
+                before_json = _continuous_chart(
+                    values_before, f"Before: {col}", before_skew)
+                after_json = _continuous_chart(
+                    values_after, f"After: {col}", after_skew)
+
+                return {
                     "before_chart": before_json,
                     "after_chart": after_json,
-                    "before_skewness": float(before_skew) if before_skew is not None else None,
-                    "after_skewness": float(after_skew) if after_skew is not None else None
+                    "before_skewness": before_skew,
+                    "after_skewness": after_skew
                 }
 
             except Exception as e:
-                charts[col] = {"error": str(e)}
-
+                return {"error": str(e)}
+
+        if len(columns) < 2:
+            charts = {col: column_charts(col) for col in columns}
+        else:
+            # Columns are independent and the NumPy/FFT work releases the GIL;
+            # map keeps the results in request order
+            max_workers = min(len(columns), os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(column_charts, columns))
+            charts = dict(zip(columns, results))
+
+        if versions is not None:
+            _store_chart(key, charts)
         return charts
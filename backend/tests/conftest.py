@@ -0,0 +1,5 @@
+"""Pytest configuration: import the backend packages as the app does."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,36 @@
+"""Tests for FileService's Parquet copies."""
+import os
+
+import pandas as pd
+import pytest
+
+from services import FileService
+
+pytest.importorskip("pyarrow")
+
+
+def test_parquet_copy_after_preprocessing_keeps_csv_dtypes(tmp_path):
+    """A preprocessed file reads with the same dtypes with or without its Parquet copy."""
+    path = str(tmp_path / "working_data.csv")
+    pd.DataFrame({
+        "income": ["1.5", "?", "2.25", "40", "3"],
+        "count": [1, 2, 3, 4, 5],
+        "group": ["a", "b", "?", "a", "b"],
+    }).to_csv(path, index=False)
+
+    # What POST /api/preprocess does with the default "keep" strategy
+    df = FileService.read_dataset(path)
+    assert df["income"].dtype == object
+    df = df.replace("?", None)
+    FileService.save_dataset(df, path)
+    FileService.schedule_parquet_copy(path).result()
+
+    assert FileService.fresh_parquet_path(path) is not None
+    with_copy = FileService.read_dataset(path).dtypes
+
+    os.remove(FileService.parquet_path(path))
+    FileService.invalidate(path)
+    without_copy = FileService.read_dataset(path).dtypes
+
+    pd.testing.assert_series_equal(with_copy, without_copy)
+    assert with_copy["income"] == "float64"
@@ -1,6 +1,6 @@
 import logging
+import numpy as np
 import pandas as pd
-from scipy.stats import skew
 
 logger = logging.getLogger(__name__)
 
@@ -9,7 +9,8 @@ def compute_skewness(series):
     """
     Compute skewness for a pandas Series.
 
-    Converts values to numeric, drops NaNs, and calculates skewness using scipy.
+    Converts values to numeric, drops NaNs, and calculates the (biased) sample
+    skewness, as scipy.stats.skew does.
 
     Args:
         series (pd.Series): Input pandas Series
@@ -17,38 +18,233 @@ def compute_skewness(series):
     Returns:
         float or None: Skewness value, or None if series is empty after cleaning
 
+    Raises:
+        ValueError: If series has fewer than 2 non-NA numeric values
+    """
+    return compute_moments(series)[1]
+
+
+def compute_moments(series):
+    """
+    Count non-NA values of a pandas Series and compute its skewness together.
+
+    The numeric values are extracted into one float64 array whose NaN mask
+    serves both the count and the cleaning, instead of a separate notna()
+    pass over the Series.
+
+    Args:
+        series (pd.Series): Input pandas Series
+
+    Returns:
+        tuple: (number of non-NA values, skewness or None as in compute_skewness)
+
     Raises:
         ValueError: If series has fewer than 2 non-NA numeric values
     """
     if not isinstance(series, pd.Series):
         raise TypeError("Input must be a pandas Series")
 
-    # Convert to numeric, coercing errors to NaN
-    numeric_series = pd.to_numeric(series, errors='coerce')
+    if series.dtype.kind in "fiub":
+        # Already numeric: one float64 view/copy, no to_numeric pass
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    else:
+        # Convert to numeric, coercing errors to NaN
+        values = pd.to_numeric(series, errors='coerce').to_numpy(
+            dtype=np.float64, na_value=np.nan)
 
     # Drop NaN values
-    clean_series = numeric_series.dropna()
+    clean = values[~np.isnan(values)]
+
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        # Only missing values become NaN, so the mask already counts them
+        n_nonnull = len(clean)
+    else:
+        # Non-numeric text is present but not usable for skewness
+        n_nonnull = int(series.notna().sum())
 
     # Check if series is empty
-    if len(clean_series) == 0:
+    if len(clean) == 0:
         logger.warning("Series is empty after dropping NaNs")
-        return None
+        return n_nonnull, None
 
     # Check minimum sample size
-    if len(clean_series) < 2:
+    if len(clean) < 2:
         logger.error(
-            f"Insufficient data: only {len(clean_series)} non-NA numeric value(s)")
+            f"Insufficient data: only {len(clean)} non-NA numeric value(s)")
         raise ValueError(
             "Series must have at least 2 non-NA numeric values to compute skewness")
 
-    # Compute skewness
-    skewness_value = skew(clean_series)
+    return n_nonnull, skewness_from_array(clean)
+
+
+def skewness_from_array(clean):
+    """
+    Compute skewness of an already-cleaned float64 NumPy array.
+
+    Lets callers that also need the numeric values (e.g. for plotting) clean
+    a column once and share the array.
+
+    Args:
+        clean (np.ndarray): float64 values without NaN, at least 2 of them
+
+    Returns:
+        float: Biased sample skewness, NaN for a constant array
+    """
+    # Biased sample skewness (scipy.stats.skew's default) from the centred
+    # values, reusing the squares for the third moment
+    mean = clean.mean()
+    centred = clean - mean
+    squares = centred * centred
+    m2 = squares.mean()
+    m3 = np.dot(squares, centred) / len(clean)
+    # Like scipy, a (numerically) constant column has undefined skewness;
+    # same machine-epsilon threshold as scipy.stats.skew
+    if m2 <= (np.finfo(np.float64).eps * mean) ** 2:
+        skewness_value = np.nan
+    else:
+        skewness_value = m3 / m2 ** 1.5
     logger.info(
-        f"Computed skewness: {skewness_value:.4f} (n={len(clean_series)})")
+        f"Computed skewness: {skewness_value:.4f} (n={len(clean)})")
 
     return float(skewness_value)
 
 
+# Cells per block of columns (about 16 MB per float64 buffer), so the
+# temporaries stay bounded however long the columns are
+_BLOCK_CELLS = 1 << 21
+
+
+def column_blocks(columns, n_rows):
+    """
+    Split column names into blocks of about _BLOCK_CELLS cells each.
+
+    Args:
+        columns (list): Column names
+        n_rows (int): Number of rows of each column
+
+    Returns:
+        list: Lists of column names, at least one column per block
+    """
+    size = max(1, _BLOCK_CELLS // max(n_rows, 1))
+    return [columns[start:start + size] for start in range(0, len(columns), size)]
+
+
+def compute_skewness_columns(df, columns):
+    """
+    Compute skewness of several numeric DataFrame columns in vectorized blocks.
+
+    Gives the same values as compute_skewness up to the last bits of
+    rounding, but moments of a block of columns are computed together,
+    without per-column pandas/Python overhead. Blocks are sized by cell
+    count and share the same buffers.
+
+    Args:
+        df (pd.DataFrame): Input DataFrame
+        columns (list): Column names to analyze
+
+    Returns:
+        dict: Column name -> skewness, for the numeric columns with at least
+        2 non-NA values; others are left out for compute_skewness to handle
+    """
+    if not df.columns.is_unique:
+        return {}
+    numeric = [col for col in dict.fromkeys(columns)
+               if col in df.columns and df[col].dtype.kind in "fiub"]
+    blocks = column_blocks(numeric, len(df))
+    if not blocks:
+        return {}
+
+    # One contiguous row per column so each reduction is a pairwise sum
+    shape = (len(blocks[0]), len(df))
+    buffer, squares = np.empty(shape), np.empty(shape)
+    missing = np.empty(shape, dtype=bool)
+
+    # Constant-column threshold of skewness_from_array and scipy.stats.skew
+    eps = np.finfo(np.float64).eps
+    result = {}
+    for block in blocks:
+        values, sq, miss = buffer[:len(block)], squares[:len(block)], missing[:len(block)]
+        for row, col in zip(values, block):
+            row[:] = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        np.isnan(values, out=miss)
+        counts = len(df) - miss.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            # Missing values count as 0 in the sums; values becomes the
+            # centred values in place
+            np.copyto(values, 0.0, where=miss)
+            mean = values.sum(axis=1) / counts
+            np.subtract(values, mean[:, None], out=values)
+            np.copyto(values, 0.0, where=miss)
+            np.multiply(values, values, out=sq)
+            m2 = sq.sum(axis=1) / counts
+            m3 = np.einsum("ij,ij->i", sq, values) / counts
+            skewness = np.where(m2 <= (eps * mean) ** 2,
+                                np.nan, m3 / m2 ** 1.5)
+        for col, n, value in zip(block, counts.tolist(), skewness.tolist()):
+            if n >= 2:
+                result[col] = value
+    return result
+
+
+# Integer columns spanning fewer values than this use a presence table
+_DENSE_SPAN = 1 << 20
+
+
+def bounded_nunique(series, cap=21):
+    """
+    Count distinct non-NA values of a pandas Series, stopping once above `cap`.
+
+    Scans in growing chunks, so high-cardinality columns are rejected after a
+    few thousand rows instead of hashing the whole column. Integer columns
+    with a small value range mark a boolean table instead of hashing.
+
+    Args:
+        series (pd.Series): Input pandas Series
+        cap (int): Largest count that needs to be exact
+
+    Returns:
+        int: Number of distinct values, or cap + 1 if there are more than `cap`
+    """
+    values = series.to_numpy()
+    seen = set()
+    start, chunk = 0, 4096
+    if values.dtype.kind in "iu" and len(values):
+        # NumPy integers have no NA; a small value range is counted with a
+        # presence table instead of hashing. The range is taken from the first
+        # chunk, so rejecting a column never needs a pass over all of it
+        lo, hi = int(values[:chunk].min()), int(values[:chunk].max())
+        if hi - lo < _DENSE_SPAN:
+            present = np.zeros(hi - lo + 1, dtype=bool)
+            while start < len(values):
+                part = values[start:start + chunk]
+                if part.min() < lo or part.max() > hi:
+                    # Outside the table: carry on hashing from this chunk
+                    seen.update(lo + offset for offset in np.flatnonzero(present).tolist())
+                    break
+                # Offset in the unsigned type or in int64, so it can't overflow
+                offsets = (part - part.dtype.type(lo) if values.dtype.kind == "u"
+                           else part.astype(np.int64) - lo)
+                present[offsets] = True
+                count = int(np.count_nonzero(present))
+                if count > cap:
+                    return cap + 1
+                start += chunk
+                chunk = min(chunk * 2, 1 << 20)
+            if start >= len(values):
+                return count
+
+    while start < len(series):
+        uniques = pd.unique(series.iloc[start:start + chunk].dropna())
+        if len(uniques) > cap:
+            return cap + 1
+        seen.update(uniques.tolist())
+        if len(seen) > cap:
+            return cap + 1
+        start += chunk
+        chunk = min(chunk * 2, 1 << 20)
+    return len(seen)
+
+
 if __name__ == "__main__":
     # Configure logging for test
     logging.basicConfig(level=logging.INFO)
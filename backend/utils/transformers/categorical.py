@@ -4,7 +4,88 @@ import pandas as pd
 import numpy as np
 from imblearn.under_sampling import RandomUnderSampler
 from imblearn.over_sampling import RandomOverSampler, SMOTE, SMOTENC
-from sklearn.utils.class_weight import compute_class_weight
+from imblearn.utils import check_sampling_strategy
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.neighbors import NearestNeighbors
+
+# SMOTE's default k_neighbors; its estimator also returns the sample itself
+_SMOTE_K_NEIGHBORS = 5
+
+
+def _already_balanced(counts: np.ndarray, sampling_strategy) -> bool:
+    """True if 'auto' resampling of classes with these counts would change nothing."""
+    return (isinstance(sampling_strategy, str) and sampling_strategy == 'auto'
+            and counts.size >= 2 and counts.min() == counts.max())
+
+
+def _fill_with_mean(column: pd.Series) -> pd.Series:
+    """
+    Replace missing values of a numeric column with its mean.
+
+    Nullable (pd.NA) columns become float64 first: Int64 can't hold a
+    non-integral mean, and imblearn can't read pd.NA.
+    """
+    if not isinstance(column.dtype, np.dtype):
+        column = pd.Series(
+            column.to_numpy(dtype=np.float64, na_value=np.nan),
+            index=column.index, name=column.name, copy=False)
+    return column.fillna(column.mean())
+
+
+def _resample_chunk(sampler, X_chunk: pd.DataFrame, y_chunk: pd.Series, label: str, target: int, seed: Optional[int]) -> tuple[pd.DataFrame, pd.Series]:
+    """Grow one class of a chunk to `target` rows; returns only the synthetic rows."""
+    chunk_sampler = clone(sampler).set_params(
+        sampling_strategy={label: target}, random_state=seed)
+    X_res, y_res = chunk_sampler.fit_resample(X_chunk, y_chunk)
+    # imblearn appends the synthetic rows after the input rows
+    return X_res.iloc[len(X_chunk):], y_res.iloc[len(y_chunk):]
+
+
+def _chunked_fit_resample(sampler, X: pd.DataFrame, y: pd.Series, chunk_size: int, n_jobs: Optional[int]) -> tuple[pd.DataFrame, pd.Series]:
+    """
+    Run a SMOTE sampler on row chunks of each class in parallel processes.
+
+    Each class to grow is split into chunks of about chunk_size rows, and
+    every chunk is resampled together with a few rows of another class (the
+    samplers need two classes, but only search neighbours within the class
+    being grown), so each worker receives, searches and encodes one chunk.
+    Synthetic rows come from neighbours within their chunk rather than the
+    whole class, and are appended after the original rows.
+    """
+    # Synthetic rows to generate per class, as the sampler itself would
+    needed = check_sampling_strategy(
+        sampler.sampling_strategy, y, "over-sampling")
+    labels = y.to_numpy()
+    rows_by_class = {label: np.flatnonzero(labels == label)
+                     for label in pd.unique(labels)}
+
+    tasks = []
+    for label, n_samples in needed.items():
+        if n_samples == 0:
+            continue
+        rows = rows_by_class[label]
+        # Fixed companion sample, not a whole class pickled to every worker
+        companion = max((r for other, r in rows_by_class.items() if other != label),
+                        key=len)[:_SMOTE_K_NEIGHBORS + 1]
+        chunks = np.array_split(rows, max(1, len(rows) // chunk_size))
+        # Spread the synthetic rows over the chunks as evenly as possible
+        shares = np.full(len(chunks), n_samples // len(chunks))
+        shares[:n_samples % len(chunks)] += 1
+        for chunk, share in zip(chunks, shares.tolist()):
+            if share:
+                tasks.append((np.concatenate([chunk, companion]), label, len(chunk) + share))
+
+    seed = sampler.random_state
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(_resample_chunk)(
+            sampler, X.iloc[rows], y.iloc[rows], label, target,
+            None if seed is None else seed + i)
+        for i, (rows, label, target) in enumerate(tasks))
+
+    X_res = pd.concat([X] + [X_new for X_new, _ in results], ignore_index=True)
+    y_res = pd.concat([y] + [y_new for _, y_new in results], ignore_index=True)
+    return X_res, y_res
 
 
 class CategoricalTransformer:
@@ -25,21 +106,25 @@ class CategoricalTransformer:
             Resampled DataFrame
         """
         df_reset = df.reset_index(drop=True)
-        X = df_reset.drop(columns=[target_col])
         y = df_reset[target_col].astype(str).reset_index(drop=True)
 
-        # Add row ID to track original indices
-        X_with_id = X.copy()
-        X_with_id["__row_id__"] = X_with_id.index
+        # Equal classes need no resampling: keep the rows as they are
+        if _already_balanced(y.value_counts().to_numpy(), sampling_strategy):
+            return df_reset
+
+        # Random resampling only looks at y: resample a one-column frame of
+        # row IDs instead of a copy of every feature, then gather the rows
+        X_with_id = pd.DataFrame({"__row_id__": np.arange(len(df_reset))})
 
         sampler = RandomOverSampler(
             # type: ignore[arg-type]
             sampling_strategy=sampling_strategy, random_state=random_state)
         X_res, y_res = sampler.fit_resample(X_with_id, y)  # type: ignore[misc]
 
-        # Reconstruct DataFrame using original row indices
-        row_ids = X_res["__row_id__"].astype(int).tolist()
-        df_res = df_reset.iloc[row_ids].reset_index(drop=True)
+        # Reconstruct DataFrame using original row indices (an int64 array
+        # for take, not a list of boxed Python ints)
+        row_ids = X_res["__row_id__"].to_numpy(dtype=np.int64)
+        df_res = df_reset.take(row_ids).reset_index(drop=True)
 
         return df_res
 
@@ -58,26 +143,30 @@ class CategoricalTransformer:
             Resampled DataFrame
         """
         df_reset = df.reset_index(drop=True)
-        X = df_reset.drop(columns=[target_col])
         y = df_reset[target_col].astype(str).reset_index(drop=True)
 
-        # Add row ID to track original indices
-        X_with_id = X.copy()
-        X_with_id["__row_id__"] = X_with_id.index
+        # Equal classes need no resampling: keep the rows as they are
+        if _already_balanced(y.value_counts().to_numpy(), sampling_strategy):
+            return df_reset
+
+        # Random resampling only looks at y: resample a one-column frame of
+        # row IDs instead of a copy of every feature, then gather the rows
+        X_with_id = pd.DataFrame({"__row_id__": np.arange(len(df_reset))})
 
         sampler = RandomUnderSampler(
             # type: ignore[arg-type]
             sampling_strategy=sampling_strategy, random_state=random_state)
         X_res, y_res = sampler.fit_resample(X_with_id, y)  # type: ignore[misc]
 
-        # Reconstruct DataFrame using original row indices
-        row_ids = X_res["__row_id__"].astype(int).tolist()
-        df_res = df_reset.iloc[row_ids].reset_index(drop=True)
+        # Reconstruct DataFrame using original row indices (an int64 array
+        # for take, not a list of boxed Python ints)
+        row_ids = X_res["__row_id__"].to_numpy(dtype=np.int64)
+        df_res = df_reset.take(row_ids).reset_index(drop=True)
 
         return df_res
 
     @staticmethod
-    def smote(df: pd.DataFrame, target_col: str, sampling_strategy: Union[str, float, int, dict] = 'auto', random_state: int = 42, categorical_columns: Optional[List[str]] = None) -> pd.DataFrame:
+    def smote(df: pd.DataFrame, target_col: str, sampling_strategy: Union[str, float, int, dict] = 'auto', random_state: int = 42, categorical_columns: Optional[List[str]] = None, n_jobs: Optional[int] = -1, chunk_size: Optional[int] = None) -> pd.DataFrame:
         """
         Apply SMOTE or SMOTE-NC oversampling to balance classes.
         Uses SMOTE-NC when categorical_columns are provided, otherwise uses standard SMOTE.
@@ -88,6 +177,11 @@ class CategoricalTransformer:
             sampling_strategy: Sampling strategy ('auto', float, int, or dict)
             random_state: Random seed
             categorical_columns: List of categorical column names (excluding target). If provided, uses SMOTE-NC.
+            n_jobs: Parallel jobs for the nearest-neighbour search, or for the
+                chunks when chunk_size is set (-1 = all cores)
+            chunk_size: Resample each class in row chunks of about this many
+                rows, in parallel processes, to bound memory and search size
+                on very large classes. None (default) resamples whole classes.
 
         Returns:
             Resampled DataFrame with synthetic samples
@@ -99,8 +193,21 @@ class CategoricalTransformer:
         X = df_reset.drop(columns=[target_col])
         y = df_reset[target_col].astype(str).reset_index(drop=True)
 
+        # Neighbour search parallelized across cores (one core per chunk when
+        # chunks already run in parallel); same neighbours as SMOTE's own
+        # default estimator. Features stay float64: sklearn upcasts float32
+        # distance blocks anyway, and narrowing would round the original rows
+        # that SMOTE returns
+        k_neighbors = NearestNeighbors(
+            n_neighbors=_SMOTE_K_NEIGHBORS + 1,
+            n_jobs=1 if chunk_size else n_jobs)
+
         # Validate sampling_strategy for multi-class
-        nunique = y.nunique()
+        class_counts = y.value_counts().to_numpy()
+        nunique = len(class_counts)
+        # With equal classes SMOTE would add no samples; the features are
+        # still prepared below, but imblearn's validation and encoding are skipped
+        balanced = _already_balanced(class_counts, sampling_strategy)
         if isinstance(sampling_strategy, (int, float)) and not isinstance(sampling_strategy, bool):
             if nunique > 2:
                 # Multi-class: float not allowed, use 'auto' instead
@@ -119,72 +226,95 @@ class CategoricalTransformer:
                     "None of the specified categorical columns found in the dataset"
                 )
 
-            # Store original categorical mappings to revert encoding later
-            categorical_mappings = {}
-
-            # For SMOTE-NC, convert categorical columns to numeric codes if they're not already numeric
-            X_processed = X.copy()
-            for col in categorical_columns:
-                if col in X_processed.columns:
-                    if X_processed[col].dtype == 'object':
-                        # Create categorical and store the mapping
-                        cat_data = pd.Categorical(X_processed[col])
-                        categorical_mappings[col] = cat_data.categories
-                        X_processed[col] = cat_data.codes
-
-            # Fill NaN values for numerical columns
-            numeric_cols = X_processed.select_dtypes(
-                include=['number']).columns
-            for col in numeric_cols:
-                if X_processed[col].isna().any():
-                    X_processed[col] = X_processed[col].fillna(
-                        X_processed[col].mean())
+            # Object columns converted to category dtype, to turn back later
+            converted = []
+
+            # Prepare each column as its own array and build the SMOTE-NC
+            # input frame once, instead of assigning into a copy of X column
+            # by column: object categoricals become category dtype, which
+            # SMOTENC one-hot encodes by value (no integer codes to round and
+            # map back), NaNs in numeric columns become the column mean
+            categorical_set = set(categorical_columns)
+            arrays = []
+            for i, col in enumerate(X.columns):
+                values = X.iloc[:, i]
+                if col in categorical_set and values.dtype == 'object':
+                    values = values.astype('category')
+                    converted.append(col)
+                elif values.dtype.kind in "iufc" and values.hasnans:
+                    values = _fill_with_mean(values)
+                arrays.append(values)
+            X_processed = pd.DataFrame(
+                dict(enumerate(arrays)), index=X.index, copy=False)
+            X_processed.columns = X.columns
 
             # Apply SMOTE-NC
             smote_nc = SMOTENC(
                 categorical_features=categorical_features,
                 sampling_strategy=sampling_strategy,
-                random_state=random_state
+                random_state=random_state,
+                k_neighbors=k_neighbors
             )  # type: ignore[arg-type]
-            X_res_num, y_res = smote_nc.fit_resample(
-                X_processed, y)  # type: ignore[misc]
+            if balanced:
+                X_res_num, y_res = X_processed, y
+            elif chunk_size:
+                X_res_num, y_res = _chunked_fit_resample(
+                    smote_nc, X_processed, y, chunk_size, n_jobs)
+            else:
+                X_res_num, y_res = smote_nc.fit_resample(
+                    X_processed, y)  # type: ignore[misc]
 
         else:
             # Standard SMOTE - requires all numeric
             # Check for non-numeric columns
-            non_numeric_cols = [c for c in X.columns if str(
-                X[c].dtype) in ("object", "category", "bool")]
+            # Classify every column from one dtypes Series instead of
+            # materializing each column to read its dtype
+            dtype_names = X.dtypes.astype(str)
+            non_numeric_cols = dtype_names.index[
+                dtype_names.isin(["object", "category", "bool"]).to_numpy()].tolist()
             if non_numeric_cols:
                 raise ValueError(
                     f"SMOTE requires all non-target features to be numeric. "
                     f"Non-numeric columns: {non_numeric_cols}"
                 )
 
-            # Convert to numeric and fill NaNs
-            X_numeric = X.apply(pd.to_numeric, errors='coerce')
-            X_numeric = X_numeric.apply(lambda s: s.fillna(s.mean()), axis=0)
+            # Convert to numeric and fill NaNs: columns are swapped into a
+            # shallow copy only when they need it, instead of rebuilding the
+            # whole frame twice with apply
+            X_numeric = X.copy(deep=False)
+            for pos, dtype in enumerate(X.dtypes):
+                column = X.iloc[:, pos]
+                if dtype.kind not in "iufc":
+                    column = pd.to_numeric(column, errors='coerce')
+                elif not column.hasnans:
+                    continue
+                X_numeric.isetitem(pos, _fill_with_mean(column))
 
             smote = SMOTE(sampling_strategy=sampling_strategy,
-                          random_state=random_state)  # type: ignore[arg-type]
-            X_res_num, y_res = smote.fit_resample(
-                X_numeric, y)  # type: ignore[misc]
-
-        # Reconstruct DataFrame
-        df_res = pd.DataFrame(X_res_num, columns=X.columns)
-        df_res[target_col] = y_res.values
-
-        # Revert categorical columns back to their original string values (if SMOTE-NC was used)
-        if categorical_columns and categorical_mappings:
-            for col, categories in categorical_mappings.items():
-                if col in df_res.columns:
-                    # Convert codes back to original categorical values
-                    # Round the values to nearest integer (SMOTE-NC may generate float codes)
-                    df_res[col] = df_res[col].round().astype(int)
-                    # Map codes back to original categories
-                    df_res[col] = df_res[col].apply(
-                        lambda x: categories[x] if 0 <= x < len(
-                            categories) else categories[0]
-                    )
+                          random_state=random_state,
+                          k_neighbors=k_neighbors)  # type: ignore[arg-type]
+            if balanced:
+                X_res_num, y_res = X_numeric, y
+            elif chunk_size:
+                X_res_num, y_res = _chunked_fit_resample(
+                    smote, X_numeric, y, chunk_size, n_jobs)
+            else:
+                X_res_num, y_res = smote.fit_resample(
+                    X_numeric, y)  # type: ignore[misc]
+
+        # Reconstruct DataFrame: imblearn hands DataFrame input back as a
+        # DataFrame with the same columns, so the target is appended to it
+        # instead of copying the features into another frame
+        if isinstance(X_res_num, pd.DataFrame):
+            df_res = X_res_num
+        else:
+            df_res = pd.DataFrame(X_res_num, columns=X.columns, copy=False)
+        df_res[target_col] = np.asarray(y_res)
+
+        # Revert categorical columns back to their original object dtype (if SMOTE-NC was used)
+        if categorical_columns:
+            for col in converted:
+                df_res[col] = df_res[col].astype(object)
 
         return df_res
 
@@ -194,13 +324,34 @@ class CategoricalTransformer:
         Compute balanced class weights.
 
         Args:
-            y: Target series
+            y: Target series (missing values count as their own class, as in
+                the resampling methods)
 
         Returns:
-            Dictionary mapping class labels to weights
+            Dictionary mapping class labels (as strings) to weights
         """
-        y_str = y.astype(str)
-        classes = np.array(sorted(y_str.unique().tolist()))
-        weights = compute_class_weight(
-            class_weight="balanced", classes=classes, y=y_str)
-        return {str(c): float(w) for c, w in zip(classes, weights)}
+        # Mixed Python objects (1, 1.0, True) and missing values only stay
+        # distinct as strings; a column of nothing but str is hashed as it is
+        if y.dtype == object and pd.api.types.infer_dtype(y, skipna=False) != "string":
+            y = y.astype(str)
+
+        # Count classes on integer codes instead of a full string column;
+        # missing values get a code too and become the 'nan' ('<NA>', 'NaT')
+        # class that astype(str) gives them
+        codes, uniques = pd.factorize(y, use_na_sentinel=False)
+        counts = np.bincount(codes, minlength=len(uniques))
+
+        if y.dtype == object:
+            # Already distinct strings: sort them with their counts in C
+            labels = uniques.to_numpy()
+            order = labels.argsort()
+            labels, class_counts = labels[order], counts[order]
+        else:
+            # Merge by string label, which also sorts the classes as before
+            labels, inverse = np.unique(
+                np.array([str(u) for u in uniques], dtype=object), return_inverse=True)
+            class_counts = np.bincount(inverse, weights=counts)
+
+        # "balanced": n_samples / (n_classes * class_count)
+        weights = class_counts.sum() / (len(labels) * class_counts)
+        return dict(zip(labels.tolist(), weights.tolist()))
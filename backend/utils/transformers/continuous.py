@@ -1,8 +1,68 @@
 """Continuous data skewness correction methods."""
 import pandas as pd
 import numpy as np
+from functools import lru_cache
 from typing import Literal
-from sklearn.preprocessing import QuantileTransformer, PowerTransformer
+from scipy import special, stats
+
+# Quantiles and bound tolerance of sklearn's QuantileTransformer
+_N_QUANTILES = 1000
+_BOUNDS_THRESHOLD = 1e-7
+# Normal outputs are clipped here so the bounds don't map to infinity
+_NORMAL_CLIP = (special.ndtri(_BOUNDS_THRESHOLD - np.spacing(1)),
+                special.ndtri(1 - (_BOUNDS_THRESHOLD - np.spacing(1))))
+
+
+# Upper |skewness| limit of each method bucket; larger (or NaN) is extreme
+_SKEW_LIMITS = np.array([0.5, 1, 2, 3])
+# Method per bucket, for positive and for negative skewness
+_POSITIVE_METHODS = ("None (already symmetric)", "Square Root",
+                     "Log Transformation", "Yeo-Johnson", "Quantile Transformer")
+_NEGATIVE_METHODS = ("None (already symmetric)", "Squared Power",
+                     "Cubed Power", "Yeo-Johnson", "Quantile Transformer")
+
+
+@lru_cache(maxsize=None)
+def _quantile_references(n_quantiles: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Reference levels, the quantile levels to read and the negated reversed
+    levels (read-only). The quantile levels keep the rounding of the former
+    np.percentile(values, references * 100) call.
+    """
+    references = np.linspace(0, 1, n_quantiles)
+    arrays = (references, references * 100 / 100, -references[::-1])
+    for array in arrays:
+        array.setflags(write=False)
+    return arrays
+
+
+def _sorted_quantiles(ordered: np.ndarray, fractions: np.ndarray) -> np.ndarray:
+    """
+    np.quantile(ordered, fractions) for an already sorted array.
+
+    Reads the neighbours straight from the sorted values with NumPy's linear
+    interpolation, instead of paying np.percentile's partition over all
+    values for each of the 1000 levels.
+    """
+    n = len(ordered)
+    virtual = (n - 1) * fractions
+    previous = np.floor(virtual)
+    gamma = virtual - previous
+    previous = previous.astype(np.intp)
+    # The top level interpolates the last value with itself
+    lower = ordered[np.minimum(previous, n - 1)]
+    upper = ordered[np.minimum(previous + 1, n - 1)]
+    # Interpolate from the nearer end of each interval, as NumPy's lerp does
+    # in current releases; the last bits can differ across NumPy versions
+    diff = upper - lower
+    return np.where(gamma >= 0.5, upper - diff * (1 - gamma), lower + diff * gamma)
+
+
+def _plain_values(series: pd.Series) -> np.ndarray | None:
+    """The NumPy int/float array behind a Series, or None for other dtypes."""
+    if isinstance(series.dtype, np.dtype) and series.dtype.kind in "iuf":
+        return series.to_numpy()
+    return None
 
 
 class ContinuousTransformer:
@@ -11,38 +71,97 @@ class ContinuousTransformer:
     @staticmethod
     def apply_square_root(series: pd.Series) -> pd.Series:
         """Apply square root transformation (for small positive skew)."""
-        return pd.Series(np.sqrt(series), index=series.index)
+        values = _plain_values(series)
+        if values is None:
+            return pd.Series(np.sqrt(series), index=series.index)
+        return pd.Series(np.sqrt(values), index=series.index, copy=False)
 
     @staticmethod
     def apply_log(series: pd.Series) -> pd.Series:
         """Apply log transformation (for medium positive skew)."""
-        return pd.Series(np.log1p(series), index=series.index)
+        values = _plain_values(series)
+        if values is None:
+            return pd.Series(np.log1p(series), index=series.index)
+        return pd.Series(np.log1p(values), index=series.index, copy=False)
 
     @staticmethod
     def apply_square_power(series: pd.Series) -> pd.Series:
         """Apply squared power transformation (for small negative skew)."""
-        return pd.Series(np.power(series, 2), index=series.index)
+        values = _plain_values(series)
+        if values is None:
+            return pd.Series(np.power(series, 2), index=series.index)
+        # Results are fresh arrays: wrap them without the copy pandas makes
+        # of NumPy input by default under copy-on-write
+        return pd.Series(np.square(values), index=series.index, copy=False)
 
     @staticmethod
     def apply_cube_power(series: pd.Series) -> pd.Series:
         """Apply cubed power transformation (for medium negative skew)."""
-        return pd.Series(np.power(series, 3), index=series.index)
+        values = _plain_values(series)
+        if values is None:
+            return pd.Series(np.power(series, 3), index=series.index)
+        # x * x * x into one buffer; np.power(x, 3) takes the slow generic pow
+        cubed = np.square(values)
+        np.multiply(cubed, values, out=cubed)
+        return pd.Series(cubed, index=series.index, copy=False)
 
     @staticmethod
     def apply_yeo_johnson(df: pd.DataFrame, col: str) -> pd.DataFrame:
-        """Apply Yeo-Johnson transformation (for severe skew)."""
-        pt = PowerTransformer(method='yeo-johnson')
-        transformed = pt.fit_transform(df[[col]]).flatten()
-        df[col] = transformed
+        """
+        Apply Yeo-Johnson transformation (for severe skew).
+
+        Same result as sklearn's PowerTransformer (lambda fitted by maximum
+        likelihood, output standardized, NaN kept), on the 1-D column.
+        """
+        values = df[col].to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+        present = ~np.isnan(values)
+        if present.any():
+            transformed, _ = stats.yeojohnson(values[present])
+            n, mean, var = len(transformed), transformed.mean(), transformed.var()
+            # Like StandardScaler, a (numerically) constant column is only centred
+            eps = np.finfo(np.float64).eps
+            constant = var <= n * eps * var + (n * mean * eps) ** 2
+            values[present] = (transformed - mean) / (1.0 if constant else np.sqrt(var))
+        df[col] = values
         return df
 
     @staticmethod
     def apply_quantile_transformer(df: pd.DataFrame, col: str, output_distribution: Literal['uniform', 'normal'] = 'normal', random_state: int = 42) -> pd.DataFrame:
-        """Apply Quantile Transformer (for extreme skew)."""
-        qt = QuantileTransformer(
-            output_distribution=output_distribution, random_state=random_state)
-        transformed = qt.fit_transform(df[[col]]).flatten()
-        df[col] = transformed
+        """
+        Apply Quantile Transformer (for extreme skew).
+
+        Maps the 1-D column the way sklearn's QuantileTransformer does (1000
+        quantiles, ties get the mean of both interpolation directions), with
+        the quantiles taken from every value rather than a random subsample,
+        so random_state is no longer used.
+        """
+        values = df[col].to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+        present = ~np.isnan(values)
+        finite = values[present]
+        if finite.size:
+            # Interpolating sorted values walks the quantiles in order (much
+            # faster than random lookups); the sort order puts results back
+            order = np.argsort(finite)
+            ordered = finite[order]
+            references, levels, reversed_references = _quantile_references(
+                min(_N_QUANTILES, len(values)))
+            # Rounding can leave neighbouring quantiles out of order; sklearn
+            # makes them monotonic the same way
+            quantiles = np.maximum.accumulate(_sorted_quantiles(ordered, levels))
+            mapped = 0.5 * (
+                np.interp(ordered, quantiles, references)
+                - np.interp(-ordered[::-1], -quantiles[::-1], reversed_references)[::-1]
+            )
+            if output_distribution == 'normal':
+                mapped[ordered + _BOUNDS_THRESHOLD > quantiles[-1]] = 1
+                mapped[ordered - _BOUNDS_THRESHOLD < quantiles[0]] = 0
+                mapped = np.clip(special.ndtri(mapped), *_NORMAL_CLIP)
+            else:
+                mapped[ordered == quantiles[-1]] = 1
+                mapped[ordered == quantiles[0]] = 0
+            finite[order] = mapped
+            values[present] = finite
+        df[col] = values
         return df
 
     @staticmethod
@@ -56,20 +175,10 @@ class ContinuousTransformer:
         Returns:
             String name of the recommended method
         """
-        if abs(skew_value) <= 0.5:
-            return "None (already symmetric)"
-        elif skew_value > 0.5 and skew_value <= 1:
-            return "Square Root"
-        elif skew_value > 1 and skew_value <= 2:
-            return "Log Transformation"
-        elif skew_value < -0.5 and skew_value >= -1:
-            return "Squared Power"
-        elif skew_value < -1 and skew_value >= -2:
-            return "Cubed Power"
-        elif (skew_value > 2 and skew_value <= 3) or (skew_value < -2 and skew_value >= -3):
-            return "Yeo-Johnson"
-        else:
-            return "Quantile Transformer"
+        # Buckets are closed towards zero: |skew| in (0.5, 1] is Square Root
+        # above zero and Squared Power below
+        methods = _NEGATIVE_METHODS if skew_value < 0 else _POSITIVE_METHODS
+        return methods[int(np.searchsorted(_SKEW_LIMITS, abs(skew_value)))]
 
     @staticmethod
     def apply_transformation(df: pd.DataFrame, col: str, skew_value: float) -> pd.DataFrame:
@@ -84,19 +193,59 @@ class ContinuousTransformer:
         Returns:
             Transformed DataFrame
         """
-        if abs(skew_value) <= 0.5:
-            return df
-        elif skew_value > 0.5 and skew_value <= 1:
-            df[col] = ContinuousTransformer.apply_square_root(df[col])
-        elif skew_value > 1 and skew_value <= 2:
-            df[col] = ContinuousTransformer.apply_log(df[col])
-        elif skew_value < -0.5 and skew_value >= -1:
-            df[col] = ContinuousTransformer.apply_square_power(df[col])
-        elif skew_value < -1 and skew_value >= -2:
-            df[col] = ContinuousTransformer.apply_cube_power(df[col])
-        elif (skew_value > 2 and skew_value <= 3) or (skew_value < -2 and skew_value >= -3):
-            df = ContinuousTransformer.apply_yeo_johnson(df, col)
-        else:
-            df = ContinuousTransformer.apply_quantile_transformer(df, col)
+        method = ContinuousTransformer.get_transformation_method(skew_value)
+        if method in _COLUMN_TRANSFORMS:
+            df[col] = _COLUMN_TRANSFORMS[method](df[col])
+        elif method in _FRAME_TRANSFORMS:
+            df = _FRAME_TRANSFORMS[method](df, col)
 
         return df
+
+    @staticmethod
+    def apply_elementwise_block(df: pd.DataFrame, columns: list[str], method: str) -> pd.DataFrame:
+        """
+        Apply one elementwise transformation to several float64 columns at once.
+
+        Same values as apply_transformation column by column, but the columns
+        are transformed as one 2-D block with a single in-place ufunc call,
+        so wide frames don't pay NumPy/pandas dispatch per column.
+
+        Args:
+            df: DataFrame holding the columns (not modified)
+            columns: Distinct float64 column names (a column_blocks block, so
+                the copy stays bounded)
+            method: One of the elementwise methods (square root, log, powers)
+
+        Returns:
+            DataFrame of the transformed columns, indexed like df
+        """
+        block = df[columns].to_numpy(dtype=np.float64, copy=True)
+        if method == "Cubed Power":
+            # (x * x) * x, as apply_cube_power computes it
+            squared = np.square(block)
+            np.multiply(squared, block, out=block)
+        else:
+            _BLOCK_UFUNCS[method](block, out=block)
+        return pd.DataFrame(block, index=df.index, columns=columns, copy=False)
+
+
+# Transformation per method name: column transforms return the new values,
+# frame transforms update the frame themselves
+_COLUMN_TRANSFORMS = {
+    "Square Root": ContinuousTransformer.apply_square_root,
+    "Log Transformation": ContinuousTransformer.apply_log,
+    "Squared Power": ContinuousTransformer.apply_square_power,
+    "Cubed Power": ContinuousTransformer.apply_cube_power,
+}
+_FRAME_TRANSFORMS = {
+    "Yeo-Johnson": ContinuousTransformer.apply_yeo_johnson,
+    "Quantile Transformer": ContinuousTransformer.apply_quantile_transformer,
+}
+# In-place ufunc of the elementwise methods other than cubing
+_BLOCK_UFUNCS = {
+    "Square Root": np.sqrt,
+    "Log Transformation": np.log1p,
+    "Squared Power": np.square,
+}
+# Methods apply_elementwise_block can apply
+ELEMENTWISE_METHODS = frozenset(_COLUMN_TRANSFORMS)
@@ -1,5 +1,12 @@
 """Path validation utilities for secure file operations."""
 import os
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def _dir_prefix(directory: str) -> str:
+    """Resolved directory path plus a trailing separator, computed once per directory."""
+    return os.path.realpath(directory) + os.sep
 
 
 class PathValidator:
@@ -19,28 +26,49 @@ class PathValidator:
             Tuple of (absolute_path, error_message)
             If error_message is None, the path is valid
         """
+        abs_path, _, error = PathValidator.validate_upload_path_stat(
+            file_path, base_dir, upload_dir)
+        return abs_path, error
+
+    @staticmethod
+    def validate_upload_path_stat(file_path: str, base_dir: str, upload_dir: str) -> tuple[str, os.stat_result | None, str | None]:
+        """
+        Validate that a file path is within the uploads directory, keeping its stat.
+
+        The os.stat taken to check existence is returned so readers such as
+        FileService.read_dataset can reuse it instead of statting again.
+
+        Args:
+            file_path: Relative file path from request
+            base_dir: Base directory of the application
+            upload_dir: Upload directory path
+
+        Returns:
+            Tuple of (absolute_path, stat_result, error_message)
+            If error_message is None, the path is valid
+        """
         if not file_path:
-            return "", "'file_path' is required"
+            return "", None, "'file_path' is required"
 
         # Normalize and validate path: must be relative
         norm_rel_path = os.path.normpath(file_path)
         if os.path.isabs(norm_rel_path):
-            return "", "Absolute paths are not allowed. Use relative path under 'uploads/'"
-
-        abs_path = os.path.join(base_dir, norm_rel_path)
+            return "", None, "Absolute paths are not allowed. Use relative path under 'uploads/'"
 
-        # Normalize paths for comparison (important on Windows)
-        abs_path_norm = os.path.normpath(os.path.abspath(abs_path))
-        upload_dir_norm = os.path.normpath(os.path.abspath(upload_dir))
+        # Resolve once (also follows symlinks out of the directory)
+        abs_path = os.path.realpath(os.path.join(base_dir, norm_rel_path))
 
-        # Ensure resolved path is inside the UPLOAD_DIR to prevent path traversal
-        if not abs_path_norm.startswith(upload_dir_norm):
-            return "", "Invalid file_path. Must be within the 'uploads/' directory"
+        # Ensure resolved path is inside the UPLOAD_DIR to prevent path traversal;
+        # the trailing separator also rejects siblings such as 'uploads_old/'
+        if not abs_path.startswith(_dir_prefix(upload_dir)):
+            return "", None, "Invalid file_path. Must be within the 'uploads/' directory"
 
-        if not os.path.exists(abs_path):
-            return "", f"File not found: {file_path}"
+        try:
+            st = os.stat(abs_path)
+        except OSError:
+            return "", None, f"File not found: {file_path}"
 
-        return abs_path, None
+        return abs_path, st, None
 
     @staticmethod
     def validate_any_path(file_path: str, base_dir: str, upload_dir: str, corrected_dir: str) -> tuple[str, str | None]:
@@ -56,34 +84,51 @@ class PathValidator:
         Returns:
             Tuple of (absolute_path, error_message)
         """
+        abs_p, _, error = PathValidator.validate_any_path_stat(
+            file_path, base_dir, upload_dir, corrected_dir)
+        return abs_p, error
+
+    @staticmethod
+    def validate_any_path_stat(file_path: str, base_dir: str, upload_dir: str, corrected_dir: str) -> tuple[str, os.stat_result | None, str | None]:
+        """
+        Validate path that can be in either uploads/ or corrected/ directory,
+        keeping its stat.
+
+        Args:
+            file_path: Relative file path from request
+            base_dir: Base directory of the application
+            upload_dir: Upload directory path
+            corrected_dir: Corrected directory path
+
+        Returns:
+            Tuple of (absolute_path, stat_result, error_message)
+        """
         if not file_path:
-            return "", "File path is required"
+            return "", None, "File path is required"
 
         norm_rel = os.path.normpath(file_path)
         if os.path.isabs(norm_rel):
-            return "", "Absolute paths are not allowed. Use relative paths under 'uploads/' or 'corrected/'"
-
-        abs_p = os.path.join(base_dir, norm_rel)
+            return "", None, "Absolute paths are not allowed. Use relative paths under 'uploads/' or 'corrected/'"
 
         # Determine base directory by prefix
-        path_parts = norm_rel.split(os.sep)
-        if path_parts[0] == "uploads":
+        top = norm_rel.partition(os.sep)[0]
+        if top == "uploads":
             allowed_base = upload_dir
-        elif path_parts[0] == "corrected":
+        elif top == "corrected":
             allowed_base = corrected_dir
         else:
-            return "", "Path must start with 'uploads/' or 'corrected/'"
+            return "", None, "Path must start with 'uploads/' or 'corrected/'"
 
-        # Validate path is within base directory
-        try:
-            abs_p_norm = os.path.normpath(os.path.abspath(abs_p))
-            base_norm = os.path.normpath(os.path.abspath(allowed_base))
-            if not abs_p_norm.startswith(base_norm):
-                return "", "Invalid path; must stay within its base directory"
-        except Exception:
-            return "", "Invalid path provided"
+        # Resolve once and compare against the cached base prefix; the trailing
+        # separator rejects siblings such as 'uploads_old/'
+        abs_p = os.path.realpath(os.path.join(base_dir, norm_rel))
+        if not abs_p.startswith(_dir_prefix(allowed_base)):
+            return "", None, "Invalid path; must stay within its base directory"
 
-        if not os.path.exists(abs_p):
-            return "", f"File not found: {file_path}"
+        # One stat both checks existence and serves the caller's reads
+        try:
+            st = os.stat(abs_p)
+        except OSError:
+            return "", None, f"File not found: {file_path}"
 
-        return abs_p, None
+        return abs_p, st, None